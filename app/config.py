@@ -1,8 +1,11 @@
-from pydantic_settings import BaseSettings
+import os
 from functools import lru_cache
 
+import msgspec
+from dotenv import dotenv_values
 
-class Settings(BaseSettings):
+
+class Settings(msgspec.Struct, frozen=True, kw_only=True, gc=False):
     """Application settings loaded from environment variables."""
 
     openai_api_key: str
@@ -20,6 +23,11 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     jwt_access_token_expire_minutes: int = 10080  # 7 days
 
+    # Argon2id cost for new password hashes (OWASP interactive baseline)
+    password_hash_memory_kib: int = 19456
+    password_hash_time_cost: int = 2
+    password_hash_parallelism: int = 1
+
     # Google OAuth
     google_client_id: str = ""
 
@@ -41,14 +49,24 @@ class Settings(BaseSettings):
 
     # Admin session
     admin_session_secret: str = ""
+    templates_auto_reload: bool = False  # set true in development to pick up template edits
+
+    # CORS: comma-separated browser origins, "*" for any (sent without credentials)
+    cors_allow_origins: str = "*"
+
+    @classmethod
+    def from_env(cls, env_file: str = ".env") -> "Settings":
+        """Build settings from `.env` overlaid with the process environment.
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"
+        Keys are matched case-insensitively and unknown keys are ignored.
+        Real environment variables take precedence over the `.env` file.
+        """
+        data = {k.lower(): v for k, v in dotenv_values(env_file).items() if v is not None}
+        data.update((k.lower(), v) for k, v in os.environ.items())
+        return msgspec.convert(data, cls, strict=False)
 
 
 @lru_cache
 def get_settings() -> Settings:
     """Get cached settings instance."""
-    return Settings()
+    return Settings.from_env()
@@ -1,3 +1,6 @@
+from sqlalchemy import Column, String, Table, func, select, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase
 from app.config import get_settings
@@ -8,9 +11,157 @@ class Base(DeclarativeBase):
 
 
 settings = get_settings()
-engine = create_async_engine(settings.database_url, echo=False)
+# Always drive Postgres through asyncpg, whose binary codecs hand uuid.UUID
+# values straight to the wire with no str() round-trip on bind or fetch
+engine = create_async_engine(
+    make_url(settings.database_url).set(drivername="postgresql+asyncpg"),
+    echo=False,
+    query_cache_size=2000,  # compiled-SQL cache entries (default 500)
+    # Up to 30 concurrent connections instead of the default 5 + 10 overflow
+    pool_size=20,
+    max_overflow=10,
+    pool_timeout=30,
+    # Neon closes idle connections when compute suspends; check on checkout and
+    # retire connections before they go stale
+    pool_pre_ping=True,
+    pool_recycle=1800,
+)
 async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+# Keys of inline migrations that have already been applied
+schema_migrations = Table(
+    "schema_migrations",
+    Base.metadata,
+    Column("key", String(100), primary_key=True),
+)
+
+# Inline schema migrations, applied once each in order. Append new entries;
+# never rename or edit one that has shipped. Each statement must also succeed on a
+# fresh database, where create_all has already built the current schema.
+MIGRATIONS: list[tuple[str, list[str]]] = [
+    ("add_users_is_admin_bio", [
+        "ALTER TABLE users "
+        "ADD COLUMN IF NOT EXISTS is_admin BOOLEAN DEFAULT FALSE, "
+        "ADD COLUMN IF NOT EXISTS bio VARCHAR(255)",
+    ]),
+    ("add_runs_shoe_id", [
+        "ALTER TABLE runs ADD COLUMN IF NOT EXISTS shoe_id UUID REFERENCES shoes(id)",
+    ]),
+    ("user_achievements_covering_index", [
+        "CREATE INDEX IF NOT EXISTS ix_user_achievements_user ON user_achievements (user_id) "
+        "INCLUDE (achievement_id, unlocked_at, run_id, notified)",
+        "DROP INDEX IF EXISTS ix_user_achievements_user_notified",
+        "DROP INDEX IF EXISTS ix_user_achievements_user_id",
+    ]),
+    # Legacy rows hold the strings "true"/"false"; the cast is also a no-op on boolean columns
+    ("user_achievements_notified_boolean", [
+        "ALTER TABLE user_achievements "
+        "ALTER COLUMN notified TYPE BOOLEAN USING (notified::text = 'true')",
+    ]),
+    ("user_achievements_unnotified_index", [
+        "CREATE INDEX IF NOT EXISTS ix_user_achievements_unnotified ON user_achievements (user_id) "
+        "WHERE notified = false",
+    ]),
+    ("challenges_ends_at_index", [
+        "CREATE INDEX IF NOT EXISTS ix_challenges_ends_at ON challenges (ends_at, starts_at)",
+    ]),
+    ("runs_completed_at_brin", [
+        "CREATE INDEX IF NOT EXISTS ix_runs_completed_at_brin ON runs USING brin (completed_at)",
+    ]),
+    ("server_default_timestamps_runs_challenges_events", [
+        "ALTER TABLE runs ALTER COLUMN synced_at SET DEFAULT now()",
+        "ALTER TABLE challenges ALTER COLUMN created_at SET DEFAULT now()",
+        "ALTER TABLE challenge_participations ALTER COLUMN joined_at SET DEFAULT now()",
+        "ALTER TABLE events "
+        "ALTER COLUMN created_at SET DEFAULT now(), "
+        "ALTER COLUMN updated_at SET DEFAULT now()",
+        "ALTER TABLE event_registrations ALTER COLUMN registered_at SET DEFAULT now()",
+        "ALTER TABLE user_achievements ALTER COLUMN unlocked_at SET DEFAULT now()",
+    ]),
+    ("events_active_dates_index", [
+        "CREATE INDEX IF NOT EXISTS ix_events_active_dates ON events (is_active, starts_at, ends_at)",
+        "DROP INDEX IF EXISTS ix_events_active",
+    ]),
+    ("native_enums_provider_role_activity", [
+        "DO $$ BEGIN "
+        "CREATE TYPE auth_provider_enum AS ENUM ('email', 'google', 'apple'); "
+        "EXCEPTION WHEN duplicate_object THEN NULL; END $$",
+        "DO $$ BEGIN "
+        "CREATE TYPE team_role_enum AS ENUM ('owner', 'member'); "
+        "EXCEPTION WHEN duplicate_object THEN NULL; END $$",
+        "DO $$ BEGIN "
+        "CREATE TYPE activity_type_enum AS ENUM ('run', 'achievement', 'pb', 'follow'); "
+        "EXCEPTION WHEN duplicate_object THEN NULL; END $$",
+        "ALTER TABLE users ALTER COLUMN auth_provider TYPE auth_provider_enum "
+        "USING auth_provider::text::auth_provider_enum",
+        "ALTER TABLE team_members ALTER COLUMN role DROP DEFAULT",
+        "ALTER TABLE team_members ALTER COLUMN role TYPE team_role_enum "
+        "USING role::text::team_role_enum",
+        "ALTER TABLE activity_logs ALTER COLUMN activity_type TYPE activity_type_enum "
+        "USING activity_type::text::activity_type_enum",
+    ]),
+    ("date_columns_streaks_dob", [
+        "ALTER TABLE user_streaks "
+        "ALTER COLUMN last_run_date TYPE DATE USING last_run_date::date, "
+        "ALTER COLUMN streak_start_date TYPE DATE USING streak_start_date::date",
+        # Client-supplied text: converted only if it is a real YYYY-MM-DD date (2023-02-31
+        # fails the cast, not the migration). Read as text so it is also a no-op on a fresh
+        # schema where create_all made it DATE
+        "CREATE FUNCTION pg_temp.iso_date_or_null(value text) RETURNS date LANGUAGE plpgsql AS $$ "
+        "BEGIN "
+        "IF value !~ '^[0-9]{4}-[0-9]{2}-[0-9]{2}$' THEN RETURN NULL; END IF; "
+        "RETURN value::date; "
+        "EXCEPTION WHEN datetime_field_overflow OR invalid_datetime_format THEN RETURN NULL; "
+        "END $$",
+        # Values that can't be converted are kept here, not lost, before the column drops them
+        "CREATE TABLE IF NOT EXISTS users_unconverted_date_of_birth "
+        "(user_id UUID PRIMARY KEY, date_of_birth TEXT NOT NULL)",
+        "INSERT INTO users_unconverted_date_of_birth (user_id, date_of_birth) "
+        "SELECT id, date_of_birth::text FROM users "
+        "WHERE date_of_birth IS NOT NULL AND pg_temp.iso_date_or_null(date_of_birth::text) IS NULL "
+        "ON CONFLICT (user_id) DO NOTHING",
+        "ALTER TABLE users ALTER COLUMN date_of_birth TYPE DATE USING "
+        "pg_temp.iso_date_or_null(date_of_birth::text)",
+        # Pooled connections keep their session, so don't leave the helper behind
+        "DROP FUNCTION pg_temp.iso_date_or_null(text)",
+    ]),
+    ("server_default_timestamps_users_social_shoes", [
+        "ALTER TABLE users "
+        "ALTER COLUMN created_at SET DEFAULT now(), "
+        "ALTER COLUMN updated_at SET DEFAULT now()",
+        "ALTER TABLE shoes "
+        "ALTER COLUMN created_at SET DEFAULT now(), "
+        "ALTER COLUMN updated_at SET DEFAULT now()",
+        "ALTER TABLE follows ALTER COLUMN created_at SET DEFAULT now()",
+        "ALTER TABLE teams ALTER COLUMN created_at SET DEFAULT now()",
+        "ALTER TABLE team_members ALTER COLUMN joined_at SET DEFAULT now()",
+        "ALTER TABLE activity_logs ALTER COLUMN created_at SET DEFAULT now()",
+    ]),
+    ("follows_activity_feed_indexes", [
+        "CREATE INDEX IF NOT EXISTS ix_follows_following_created "
+        "ON follows (following_id, created_at) INCLUDE (follower_id)",
+        "CREATE INDEX IF NOT EXISTS ix_follows_follower_created "
+        "ON follows (follower_id, created_at) INCLUDE (following_id)",
+        "DROP INDEX IF EXISTS ix_follows_follower_id",
+        "DROP INDEX IF EXISTS ix_follows_following_id",
+        "CREATE INDEX IF NOT EXISTS ix_activity_created ON activity_logs (created_at)",
+    ]),
+    ("personal_bests_leaderboard_index", [
+        "CREATE INDEX IF NOT EXISTS ix_personal_bests_category_time_user "
+        "ON personal_bests (distance_category, time_seconds, user_id)",
+        "DROP INDEX IF EXISTS ix_distance_category_time",
+    ]),
+    ("runs_user_completed_index", [
+        "CREATE INDEX IF NOT EXISTS ix_runs_user_completed ON runs (user_id, completed_at DESC, id)",
+        "DROP INDEX IF EXISTS ix_runs_user_id",
+    ]),
+    # get_runs orders by (completed_at DESC, id DESC); an ascending id column forced a sort
+    ("runs_user_completed_index_id_desc", [
+        "DROP INDEX IF EXISTS ix_runs_user_completed",
+        "CREATE INDEX ix_runs_user_completed ON runs (user_id, completed_at DESC, id DESC)",
+    ]),
+]
+
 
 async def get_db():
     """Yield an async database session."""
@@ -27,3 +178,23 @@ async def init_db():
     """Create all tables on startup."""
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+
+
+# Arbitrary app-wide key for the migration advisory lock
+_MIGRATIONS_LOCK_ID = 7_449_112_001
+
+
+async def run_migrations():
+    """Apply any migrations not yet recorded in schema_migrations."""
+    async with engine.begin() as conn:
+        # Workers starting together queue here; the rest then see the keys as applied
+        await conn.execute(select(func.pg_advisory_xact_lock(_MIGRATIONS_LOCK_ID)))
+        applied = set((await conn.execute(select(schema_migrations.c.key))).scalars())
+        for key, statements in MIGRATIONS:
+            if key in applied:
+                continue
+            for statement in statements:
+                await conn.execute(text(statement))
+            await conn.execute(
+                pg_insert(schema_migrations).values(key=key).on_conflict_do_nothing()
+            )
@@ -1,52 +1,121 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI, Request
-from fastapi.responses import FileResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
+from jinja2 import TemplateSyntaxError
+from langfuse import Langfuse
+from sqlalchemy import func, select
 from pathlib import Path
 
 from app.routes.plans import router as plans_router
 from app.routes.auth import router as auth_router
 from app.routes.runs import router as runs_router
 from app.routes.community import router as community_router
-from app.routes.admin import router as admin_router
+from app.routes.admin import router as admin_router, templates as admin_templates
 from app.routes.social import router as social_router
 from app.routes.shoes import router as shoes_router
-from sqlalchemy import text
-from app.database import init_db, async_session, engine
+from app.config import get_settings
+from app.database import init_db, run_migrations, async_session, engine
 from app.models.shoe import Shoe  # noqa: F401 — ensure table is created
 from app.services import analytics
+from app.services.auth_service import close_http_client, time_password_hash
 from app.services.achievement_service import seed_achievement_definitions
 from app.services.challenge_service import auto_generate_weekly_challenges, auto_generate_monthly_challenge
 
-# Get the project root directory
+logger = logging.getLogger(__name__)
+
+# Project root and the directories served from it (resolved once at import)
 BASE_DIR = Path(__file__).resolve().parent.parent
+STATIC_DIR = BASE_DIR / "static"
+WEBSITE_DIST = BASE_DIR / "website" / "dist"  # Vite build
+
+# Postgres advisory lock key: one worker across all processes seeds at a time
+_SEED_LOCK_ID = 7_449_112_002
+
+
+async def _background_seed():
+    """Seed achievement definitions and auto-generated challenges (idempotent)."""
+    try:
+        # Session-level lock on a dedicated connection, so it survives the seed's commits
+        async with engine.connect() as lock_conn:
+            if not await lock_conn.scalar(select(func.pg_try_advisory_lock(_SEED_LOCK_ID))):
+                logger.info("Another worker is seeding; skipping")
+                return
+            try:
+                async with async_session() as db:
+                    await seed_achievement_definitions(db)
+                    await auto_generate_weekly_challenges(db)
+                    await auto_generate_monthly_challenge(db)
+            finally:
+                await lock_conn.scalar(select(func.pg_advisory_unlock(_SEED_LOCK_ID)))
+    except Exception:
+        logger.exception("Background seeding failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Create tables and apply migrations, then seed in the background while serving."""
+    await init_db()
+
+    # Schema changes the ORM depends on must land before serving
+    await run_migrations()
+
+    # Parse and compile every admin template now rather than on its first request
+    for name in admin_templates.env.list_templates():
+        try:
+            admin_templates.env.get_template(name)
+        except TemplateSyntaxError:
+            logger.exception("Template %s failed to compile", name)
+    app.state.templates_ready = True
+
+    # Report what a login/register hash costs on this host with the configured params
+    hash_seconds = await asyncio.to_thread(time_password_hash)
+    logger.info("Password hash takes %.0f ms", hash_seconds * 1000)
+
+    app.state.seed_task = asyncio.create_task(_background_seed())
+
+    yield
+
+    # Stop seeding first so its lock connection and session are released, then
+    # flush analytics and LLM observability
+    app.state.seed_task.cancel()
+    with suppress(asyncio.CancelledError):
+        await app.state.seed_task
+    Langfuse().flush()
+    analytics.shutdown()
+    await close_http_client()
+
 
 app = FastAPI(
     title="Stride - AI Running Coach",
     description="Professional training plan generator powered by AI",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan,
 )
 
-# CORS middleware for development
+# CORS. The iOS app and the same-origin admin/website don't depend on it, and
+# nothing relies on cross-origin cookies. Without credentials a wildcard is sent
+# as a literal "*" instead of echoing back each request's Origin.
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
-    allow_credentials=True,
+    allow_origins=[o.strip() for o in get_settings().cors_allow_origins.split(",") if o.strip()],
+    allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
 # Mount static files
-app.mount("/static", StaticFiles(directory=BASE_DIR / "static"), name="static")
+app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 
-# Mount website dist assets (CSS/JS/images from Vite build)
-WEBSITE_DIST = BASE_DIR / "website" / "dist"
+# Marketing website (Vite build). Only its own prefixes and files are routed, so
+# unmatched API method/path pairs keep their 404/405; StaticFiles answers with
+# ETag/Last-Modified and 304s on revalidation
 app.mount("/assets", StaticFiles(directory=WEBSITE_DIST / "assets"), name="website-assets")
 app.mount("/photos", StaticFiles(directory=WEBSITE_DIST / "photos"), name="website-photos")
-
-# Templates (for admin)
-templates = Jinja2Templates(directory=BASE_DIR / "templates")
+_website_files = StaticFiles(directory=WEBSITE_DIST)
 
 # Include routers
 app.include_router(auth_router)
@@ -58,50 +127,26 @@ app.include_router(social_router)
 app.include_router(shoes_router)
 
 
-@app.on_event("startup")
-async def startup():
-    """Initialize the database and seed data on startup."""
-    await init_db()
-
-    # Migrate: add is_admin column if missing
-    async with engine.begin() as conn:
-        await conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS is_admin BOOLEAN DEFAULT FALSE"))
-        await conn.execute(text("ALTER TABLE users ADD COLUMN IF NOT EXISTS bio VARCHAR(255)"))
-        await conn.execute(text("ALTER TABLE runs ADD COLUMN IF NOT EXISTS shoe_id UUID REFERENCES shoes(id)"))
-
-    async with async_session() as db:
-        await seed_achievement_definitions(db)
-        await auto_generate_weekly_challenges(db)
-        await auto_generate_monthly_challenge(db)
-
-
-@app.on_event("shutdown")
-async def shutdown():
-    """Flush analytics and LLM observability on shutdown."""
-    from langfuse import Langfuse
-    Langfuse().flush()
-    analytics.shutdown()
-
-
 @app.get("/")
-async def home():
+async def home(request: Request):
     """Serve the marketing website homepage."""
-    return FileResponse(WEBSITE_DIST / "index.html")
+    return await _website_files.get_response("index.html", request.scope)
 
 
 @app.get("/hero-video2.mp4")
-async def hero_video():
+async def hero_video(request: Request):
     """Serve the hero video."""
-    return FileResponse(WEBSITE_DIST / "hero-video2.mp4", media_type="video/mp4")
+    return await _website_files.get_response("hero-video2.mp4", request.scope)
 
 
 @app.get("/stride-icon.svg")
-async def stride_icon():
+async def stride_icon(request: Request):
     """Serve the stride icon."""
-    return FileResponse(WEBSITE_DIST / "stride-icon.svg", media_type="image/svg+xml")
+    return await _website_files.get_response("stride-icon.svg", request.scope)
 
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy", "version": "2.0.0"}
+
@@ -1,10 +1,8 @@
-import uuid
-from datetime import datetime, timezone
-
 from sqlalchemy import (
-    Column, String, DateTime, Integer, Text, ForeignKey, UniqueConstraint, Index
+    Column, String, DateTime, Integer, Text, Boolean, ForeignKey, UniqueConstraint, Index, func, text
 )
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -25,14 +23,25 @@ class AchievementDefinition(Base):
 class UserAchievement(Base):
     __tablename__ = "user_achievements"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     achievement_id = Column(String(50), ForeignKey("achievement_definitions.id"), nullable=False)
-    unlocked_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
+    unlocked_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
     run_id = Column(UUID(as_uuid=True), ForeignKey("runs.id"), nullable=True)  # Run that triggered unlock
-    notified = Column(String(5), nullable=False, default="false")  # "true" / "false"
+    notified = Column(Boolean, nullable=False, default=False)
 
     __table_args__ = (
         UniqueConstraint("user_id", "achievement_id", name="uq_user_achievement"),
-        Index("ix_user_achievements_user_notified", "user_id", "notified"),
+        # Covering index: per-user achievement lists are answered index-only
+        Index(
+            "ix_user_achievements_user",
+            "user_id",
+            postgresql_include=["achievement_id", "unlocked_at", "run_id", "notified"],
+        ),
+        # Partial index: only the not-yet-celebrated backlog, for /achievements/unnotified
+        Index(
+            "ix_user_achievements_unnotified",
+            "user_id",
+            postgresql_where=text("notified = false"),
+        ),
     )
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, EmailStr, Field
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime
 from uuid import UUID
 
 
@@ -31,7 +31,7 @@ class AppleAuthRequest(BaseModel):
 
 class ProfileUpdateRequest(BaseModel):
     name: Optional[str] = None
-    date_of_birth: Optional[str] = None  # ISO 8601 date "YYYY-MM-DD"
+    date_of_birth: Optional[date] = None  # ISO 8601 date "YYYY-MM-DD"
     gender: Optional[str] = None
     height_cm: Optional[float] = None
     profile_photo_base64: Optional[str] = None
@@ -48,7 +48,7 @@ class UserResponse(BaseModel):
     name: Optional[str] = None
     auth_provider: str
     profile_photo_base64: Optional[str] = None
-    date_of_birth: Optional[str] = None
+    date_of_birth: Optional[date] = None
     gender: Optional[str] = None
     height_cm: Optional[float] = None
     has_completed_profile: bool = False
@@ -56,7 +56,7 @@ class UserResponse(BaseModel):
     display_name: Optional[str] = None
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True, "extra": "ignore"}
 
 
 class TokenResponse(BaseModel):
@@ -1,11 +1,9 @@
-import uuid
-from datetime import datetime, timezone
-
 from sqlalchemy import (
     Column, String, DateTime, Float, Integer, Boolean, ForeignKey,
-    UniqueConstraint, Index
+    UniqueConstraint, Index, func
 )
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -13,7 +11,7 @@ from app.database import Base
 class Challenge(Base):
     __tablename__ = "challenges"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     title = Column(String(200), nullable=False)
     challenge_type = Column(String(30), nullable=False)  # "weekly_race", "monthly_distance"
     distance_category = Column(String(10), nullable=True)  # "5K", "10K", etc. (for race type)
@@ -24,24 +22,27 @@ class Challenge(Base):
     series_id = Column(String(50), nullable=True)  # e.g. "weekly_5k" to group recurring
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
     __table_args__ = (
         Index("ix_challenges_dates", "starts_at", "ends_at"),
+        # Active/past lookups lead with ends_at: "ends_at >= now" hits only the
+        # recent tail of the index instead of every challenge that already started
+        Index("ix_challenges_ends_at", "ends_at", "starts_at"),
     )
 
 
 class ChallengeParticipation(Base):
     __tablename__ = "challenge_participations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     challenge_id = Column(UUID(as_uuid=True), ForeignKey("challenges.id"), nullable=False, index=True)
     joined_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     # For race challenges: best qualifying run
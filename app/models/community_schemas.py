@@ -1,6 +1,6 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter, field_validator
 from typing import Optional
-from datetime import datetime
+from datetime import date, datetime, timezone
 from uuid import UUID
 
 
@@ -48,6 +48,12 @@ class RunSyncPayload(BaseModel):
     # Shoe tracking
     shoe_id: Optional[UUID] = None
 
+    @field_validator("completed_at")
+    @classmethod
+    def assume_utc(cls, value: datetime) -> datetime:
+        """Naive timestamps are UTC, so they compare with the aware challenge/event windows."""
+        return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
 
 class RunBatchSyncRequest(BaseModel):
     """Batch of runs to sync to server."""
@@ -85,7 +91,7 @@ class RunResponse(BaseModel):
     is_leaderboard_eligible: bool
     synced_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True, "extra": "ignore"}
 
 
 # ── Leaderboard ──────────────────────────────────────────────────────────────
@@ -106,6 +112,7 @@ class LeaderboardResponse(BaseModel):
     your_rank: Optional[int] = None
     your_value: Optional[float] = None
     total_participants: int
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
 
 
 # ── Achievements ────────────────────────────────────────────────────────────
@@ -122,7 +129,7 @@ class AchievementDefinitionResponse(BaseModel):
     tier: str
     sort_order: int
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True, "extra": "ignore"}
 
 
 class UserAchievementResponse(BaseModel):
@@ -147,7 +154,7 @@ class UserStreakResponse(BaseModel):
     """User's streak info."""
     current_streak_days: int
     longest_streak_days: int
-    last_run_date: Optional[str] = None
+    last_run_date: Optional[date] = None
 
 
 # ── Challenges ──────────────────────────────────────────────────────────────
@@ -284,3 +291,8 @@ class TeamDetailResponse(TeamResponse):
     """Team detail with members and leaderboard."""
     members: list[TeamMemberResponse] = []
     leaderboard: list[TeamMemberResponse] = []
+
+
+# ── Precompiled adapters for hot list responses ─────────────────────────────
+
+RUN_RESPONSE_LIST_ADAPTER = TypeAdapter(list[RunResponse])
@@ -1,11 +1,9 @@
-import uuid
-from datetime import datetime, timezone
-
 from sqlalchemy import (
     Column, String, DateTime, Float, Integer, Boolean, ForeignKey, Text,
-    UniqueConstraint, Index
+    UniqueConstraint, Index, func
 )
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -13,7 +11,7 @@ from app.database import Base
 class Event(Base):
     __tablename__ = "events"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     title = Column(String(200), nullable=False)
     description = Column(Text, nullable=True)
     event_type = Column(String(30), nullable=False)  # "race", "virtual_race", "group_run"
@@ -44,31 +42,32 @@ class Event(Base):
     # Timestamps
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
 
     __table_args__ = (
         Index("ix_events_dates", "starts_at", "ends_at"),
-        Index("ix_events_active", "is_active"),
+        # Leading is_active serves the plain is_active filters that ix_events_active used to
+        Index("ix_events_active_dates", "is_active", "starts_at", "ends_at"),
     )
 
 
 class EventRegistration(Base):
     __tablename__ = "event_registrations"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     event_id = Column(UUID(as_uuid=True), ForeignKey("events.id"), nullable=False, index=True)
     registered_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
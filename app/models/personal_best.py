@@ -1,8 +1,8 @@
-import uuid
 from datetime import datetime, timezone
 
 from sqlalchemy import Column, String, DateTime, Float, Integer, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -10,7 +10,7 @@ from app.database import Base
 class PersonalBest(Base):
     __tablename__ = "personal_bests"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     distance_category = Column(String(10), nullable=False)  # "5K", "10K", "HM", "FM", "50K"
     time_seconds = Column(Integer, nullable=False)
@@ -19,5 +19,6 @@ class PersonalBest(Base):
 
     __table_args__ = (
         UniqueConstraint("user_id", "distance_category", name="uq_user_distance_category"),
-        Index("ix_distance_category_time", "distance_category", "time_seconds"),
+        # Leaderboard order: keyset pages seek straight to (time_seconds, user_id)
+        Index("ix_personal_bests_category_time_user", "distance_category", "time_seconds", "user_id"),
     )
@@ -1,7 +1,6 @@
 import uuid
-from datetime import datetime, timezone
 
-from sqlalchemy import Column, String, DateTime, Float, Integer, Text, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Float, Integer, Text, Boolean, ForeignKey, Index, func
 from sqlalchemy.dialects.postgresql import UUID
 
 from app.database import Base
@@ -12,7 +11,7 @@ class Run(Base):
 
     # Use iOS-generated UUID for deduplication
     id = Column(UUID(as_uuid=True), primary_key=True)
-    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
 
     # Core run data
     completed_at = Column(DateTime(timezone=True), nullable=False)
@@ -44,6 +43,15 @@ class Run(Base):
     # Sync metadata
     synced_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
+
+    __table_args__ = (
+        # BRIN: runs arrive roughly in completed_at order, so block ranges stay
+        # tight and the index is a tiny fraction of a btree's size
+        Index("ix_runs_completed_at_brin", "completed_at", postgresql_using="brin"),
+        # A user's runs newest first, ties by id desc: history pages (offset or
+        # keyset) read in index order with no sort step
+        Index("ix_runs_user_completed", user_id, completed_at.desc(), id.desc()),
+    )
@@ -38,6 +38,10 @@ class DayOfWeek(str, Enum):
     SUNDAY = "Sunday"
 
 
+# Day names in Monday-first order, matching date.weekday() indices
+DAY_NAMES: tuple[str, ...] = tuple(d.value for d in DayOfWeek)
+
+
 class PlanMode(str, Enum):
     """Training plan generation mode based on user's conflict resolution choice."""
     AGGRESSIVE = "aggressive"  # User overrides - build toward original goal
@@ -1,8 +1,6 @@
-import uuid
-from datetime import datetime, timezone
-
-from sqlalchemy import Column, String, DateTime, Float, Boolean, ForeignKey
+from sqlalchemy import Column, String, DateTime, Float, Boolean, ForeignKey, func
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -10,7 +8,7 @@ from app.database import Base
 class Shoe(Base):
     __tablename__ = "shoes"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
     name = Column(String(100), nullable=False)
     photo_url = Column(String(500), nullable=True)
@@ -19,12 +17,12 @@ class Shoe(Base):
     is_retired = Column(Boolean, default=False, nullable=False)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
@@ -1,3 +1,4 @@
+import msgspec
 from pydantic import BaseModel
 from typing import Optional
 from datetime import datetime
@@ -24,4 +25,15 @@ class ShoeResponse(BaseModel):
     is_retired: bool
     created_at: datetime
 
-    model_config = {"from_attributes": True}
+    model_config = {"from_attributes": True, "frozen": True, "extra": "ignore"}
+
+
+# Field names resolved once; the list route copies these straight off the ORM rows
+_SHOE_RESPONSE_FIELDS = tuple(ShoeResponse.model_fields)
+
+
+def shoes_to_json(shoes) -> bytes:
+    """Encode Shoe rows as a JSON list shaped like list[ShoeResponse], without Pydantic."""
+    return msgspec.json.encode([
+        {field: getattr(shoe, field) for field in _SHOE_RESPONSE_FIELDS} for shoe in shoes
+    ])
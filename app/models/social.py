@@ -1,36 +1,57 @@
-import uuid
-from datetime import datetime, timezone
+import enum
 
 from sqlalchemy import (
     Column, String, DateTime, Integer, Text, ForeignKey,
-    UniqueConstraint, Index
+    UniqueConstraint, Index, Enum, func
 )
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
 
+class TeamRole(str, enum.Enum):
+    OWNER = "owner"
+    MEMBER = "member"
+
+
+class ActivityType(str, enum.Enum):
+    RUN = "run"
+    ACHIEVEMENT = "achievement"
+    PB = "pb"
+    FOLLOW = "follow"
+
+
 class Follow(Base):
     __tablename__ = "follows"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    follower_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    following_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
+    follower_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
+    following_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
     __table_args__ = (
         UniqueConstraint("follower_id", "following_id", name="uq_follower_following"),
+        # Follower/following lists: filter on one side, newest first, other side from the index
+        Index(
+            "ix_follows_following_created", "following_id", "created_at",
+            postgresql_include=["follower_id"],
+        ),
+        Index(
+            "ix_follows_follower_created", "follower_id", "created_at",
+            postgresql_include=["following_id"],
+        ),
     )
 
 
 class Team(Base):
     __tablename__ = "teams"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     name = Column(String(100), nullable=False)
     description = Column(String(500), nullable=True)
     photo_url = Column(String(500), nullable=True)
@@ -39,7 +60,7 @@ class Team(Base):
     max_members = Column(Integer, nullable=False, default=50)
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
@@ -47,13 +68,17 @@ class Team(Base):
 class TeamMember(Base):
     __tablename__ = "team_members"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     team_id = Column(UUID(as_uuid=True), ForeignKey("teams.id", ondelete="CASCADE"), nullable=False, index=True)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True)
-    role = Column(String(20), nullable=False, default="member")  # "owner" / "member"
+    role = Column(
+        Enum(TeamRole, name="team_role_enum", values_callable=lambda e: [m.value for m in e]),
+        nullable=False,
+        default=TeamRole.MEMBER,
+    )
     joined_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
@@ -65,17 +90,22 @@ class TeamMember(Base):
 class ActivityLog(Base):
     __tablename__ = "activity_logs"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False)
-    activity_type = Column(String(30), nullable=False)  # "run", "achievement", "pb", "follow"
+    activity_type = Column(
+        Enum(ActivityType, name="activity_type_enum", values_callable=lambda e: [m.value for m in e]),
+        nullable=False,
+    )
     reference_id = Column(UUID(as_uuid=True), nullable=True)
     activity_data = Column(Text, nullable=True)  # JSON text
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
 
     __table_args__ = (
         Index("ix_activity_user_created", "user_id", "created_at"),
+        # Global ("everyone") feed orders by created_at across all users
+        Index("ix_activity_created", "created_at"),
     )
@@ -1,7 +1,6 @@
-import uuid
-
-from sqlalchemy import Column, String, Integer, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Date, Integer, ForeignKey, UniqueConstraint
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -9,9 +8,9 @@ from app.database import Base
 class UserStreak(Base):
     __tablename__ = "user_streaks"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     user_id = Column(UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, unique=True, index=True)
     current_streak_days = Column(Integer, nullable=False, default=0)
     longest_streak_days = Column(Integer, nullable=False, default=0)
-    last_run_date = Column(String(10), nullable=True)  # "YYYY-MM-DD"
-    streak_start_date = Column(String(10), nullable=True)  # "YYYY-MM-DD"
+    last_run_date = Column(Date, nullable=True)
+    streak_start_date = Column(Date, nullable=True)
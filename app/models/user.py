@@ -1,9 +1,8 @@
-import uuid
 import enum
-from datetime import datetime, timezone
 
-from sqlalchemy import Column, String, DateTime, Float, Text, Boolean
+from sqlalchemy import Column, String, Date, DateTime, Float, Text, Boolean, Enum, func
 from sqlalchemy.dialects.postgresql import UUID
+from uuid_utils.compat import uuid7
 
 from app.database import Base
 
@@ -24,15 +23,18 @@ class Gender(str, enum.Enum):
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
     email = Column(String(255), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=True)
-    auth_provider = Column(String(20), nullable=False)  # email, google, apple
+    auth_provider = Column(
+        Enum(AuthProvider, name="auth_provider_enum", values_callable=lambda e: [m.value for m in e]),
+        nullable=False,
+    )
     hashed_password = Column(String(255), nullable=True)  # null for social auth
 
     # Profile fields
     profile_photo_base64 = Column(Text, nullable=True)
-    date_of_birth = Column(String(10), nullable=True)  # ISO date "YYYY-MM-DD"
+    date_of_birth = Column(Date, nullable=True)
     gender = Column(String(20), nullable=True)
     height_cm = Column(Float, nullable=True)
 
@@ -55,12 +57,12 @@ class User(Base):
     # Timestamps
     created_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
         nullable=False,
     )
     updated_at = Column(
         DateTime(timezone=True),
-        default=lambda: datetime.now(timezone.utc),
-        onupdate=lambda: datetime.now(timezone.utc),
+        server_default=func.now(),
+        onupdate=func.now(),
         nullable=False,
     )
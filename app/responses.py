@@ -0,0 +1,21 @@
+"""Response classes shared across routers."""
+
+import msgspec
+from fastapi.responses import JSONResponse
+
+
+class MsgspecJSONResponse(JSONResponse):
+    """JSON response encoded with msgspec.
+
+    Return this directly from a route whose payload is already plain dicts and
+    lists built by the service layer. FastAPI skips response_model validation
+    for Response instances, so the schema stays in the docs without a second
+    Pydantic pass on the way out.
+
+    Deliberately not the app's default_response_class: with no custom class
+    set, FastAPI serializes response_model routes straight to bytes through
+    pydantic-core, and overriding the default would give up that path.
+    """
+
+    def render(self, content) -> bytes:
+        return msgspec.json.encode(content)
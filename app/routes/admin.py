@@ -1,41 +1,104 @@
 """Admin dashboard routes — Jinja2 + HTMX."""
 
+import secrets
+import time
 import uuid
 from datetime import datetime, timezone
+from functools import lru_cache
 
 from fastapi import APIRouter, Depends, Request, Form, UploadFile, File
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.templating import Jinja2Templates
-from sqlalchemy import select, func
+from starlette.concurrency import run_in_threadpool
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, select_autoescape
+from sqlalchemy import select, update, func, and_, bindparam
+from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from pathlib import Path
 
+from app.config import get_settings
 from app.database import get_db
 from app.models.user import User
 from app.models.event import Event, EventRegistration
+from app.responses import MsgspecJSONResponse
 from app.services.admin_auth import (
     get_admin_user,
     create_admin_session,
     COOKIE_NAME,
 )
-from app.services.auth_service import verify_password
+from app.services.auth_service import hash_password, verify_password
 from app.services.event_service import (
     create_event,
     update_event,
     delete_event,
     list_all_events,
     get_event_registrations,
+    get_event_leaderboard,
 )
 from app.services.storage_service import upload_file, delete_file
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-templates = Jinja2Templates(directory=BASE_DIR / "templates")
+
+# Compiled template bytecode is cached on disk so restarts skip the parse; Jinja's
+# default directory is per-user and created 0700. Without auto-reload, a cached
+# template isn't re-stat'ed on every render.
+templates = Jinja2Templates(env=Environment(
+    loader=FileSystemLoader(BASE_DIR / "templates"),
+    autoescape=select_autoescape(),
+    bytecode_cache=FileSystemBytecodeCache(),
+    auto_reload=get_settings().templates_auto_reload,
+))
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
+# Event lookups shared by the handlers below, built once and bound per call
+_EVENT_ID = bindparam("event_id", type_=UUID(as_uuid=True))
+_SELECT_EVENT = select(Event).where(Event.id == _EVENT_ID)
+_SELECT_EVENT_WITH_COUNT = select(
+    Event,
+    select(func.count(EventRegistration.id))
+    .where(EventRegistration.event_id == Event.id)
+    .correlate(Event)
+    .scalar_subquery()
+    .label("registration_count"),
+).where(Event.id == _EVENT_ID)
+
 
 # ── Login ───────────────────────────────────────────────────────────────────
 
+# Admin credentials by email: (user_id, hashed_password, expires_at). Only admins are
+# cached, so a retried login skips the lookup; changes show up within the TTL.
+_LOGIN_CACHE_TTL_SECONDS = 30
+_LOGIN_CACHE_MAX = 1024
+_login_cache: dict[str, tuple[str, str, float]] = {}
+
+
+@lru_cache
+def _dummy_hash() -> str:
+    """A throwaway password hash to verify against when there is no admin to check."""
+    return hash_password(secrets.token_urlsafe(16))
+
+
+async def _admin_credentials(db: AsyncSession, email: str) -> tuple[str, str] | None:
+    """(user_id, hashed_password) for an admin with a password, else None."""
+    now = time.monotonic()
+    cached = _login_cache.get(email)
+    if cached is not None and cached[2] > now:
+        return cached[0], cached[1]
+
+    result = await db.execute(
+        select(User.id, User.is_admin, User.hashed_password).where(User.email == email)
+    )
+    row = result.one_or_none()
+    if row is None or not row.is_admin or not row.hashed_password:
+        _login_cache.pop(email, None)
+        return None
+
+    if len(_login_cache) >= _LOGIN_CACHE_MAX:
+        _login_cache.pop(next(iter(_login_cache)))
+    _login_cache[email] = (str(row.id), row.hashed_password, now + _LOGIN_CACHE_TTL_SECONDS)
+    return str(row.id), row.hashed_password
+
 
 @router.get("/login", response_class=HTMLResponse)
 async def login_page(request: Request):
@@ -49,22 +112,24 @@ async def login_submit(
     password: str = Form(...),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(User).where(User.email == email))
-    user = result.scalar_one_or_none()
+    credentials = await _admin_credentials(db, email)
 
-    if user is None or not user.is_admin or not user.hashed_password:
+    if credentials is None:
+        # Burn the same hashing time as a real check so misses don't reveal admin emails
+        await run_in_threadpool(lambda: verify_password(password, _dummy_hash()))
         return templates.TemplateResponse(
             "admin/login.html",
             {"request": request, "error": "Invalid credentials or not an admin."},
         )
 
-    if not verify_password(password, user.hashed_password):
+    user_id, hashed_password = credentials
+    if not await run_in_threadpool(verify_password, password, hashed_password):
         return templates.TemplateResponse(
             "admin/login.html",
             {"request": request, "error": "Invalid credentials or not an admin."},
         )
 
-    token = create_admin_session(str(user.id))
+    token = create_admin_session(user_id)
     response = RedirectResponse(url="/admin/", status_code=303)
     response.set_cookie(
         key=COOKIE_NAME,
@@ -94,28 +159,29 @@ async def dashboard(
 ):
     now = datetime.now(timezone.utc)
 
-    # Stats
-    total_events = (await db.execute(select(func.count()).select_from(Event))).scalar() or 0
-    active_events = (await db.execute(
-        select(func.count()).select_from(Event)
-        .where(Event.starts_at <= now, Event.ends_at >= now, Event.is_active == True)
-    )).scalar() or 0
-    total_registrations = (await db.execute(
-        select(func.count()).select_from(EventRegistration)
-    )).scalar() or 0
-    upcoming_events = (await db.execute(
-        select(func.count()).select_from(Event)
-        .where(Event.starts_at > now, Event.is_active == True)
-    )).scalar() or 0
+    # Stats: one round-trip, conditional aggregates over events plus a registrations subquery
+    stats = (await db.execute(
+        select(
+            func.count().label("total_events"),
+            func.count().filter(
+                and_(Event.starts_at <= now, Event.ends_at >= now, Event.is_active == True)
+            ).label("active_events"),
+            select(func.count()).select_from(EventRegistration)
+            .scalar_subquery().label("total_registrations"),
+            func.count().filter(
+                and_(Event.starts_at > now, Event.is_active == True)
+            ).label("upcoming_events"),
+        ).select_from(Event)
+    )).one()
 
     return templates.TemplateResponse("admin/dashboard.html", {
         "request": request,
         "admin": admin,
         "stats": {
-            "total_events": total_events,
-            "active_events": active_events,
-            "total_registrations": total_registrations,
-            "upcoming_events": upcoming_events,
+            "total_events": stats.total_events or 0,
+            "active_events": stats.active_events or 0,
+            "total_registrations": stats.total_registrations or 0,
+            "upcoming_events": stats.upcoming_events or 0,
         },
     })
 
@@ -130,21 +196,9 @@ async def events_list(
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
+    # Column rows (no ORM instances) with registration counts, in one query
     events = await list_all_events(db, status_filter=status)
-
-    # Get registration counts
-    event_ids = [e.id for e in events]
-    counts = {}
-    if event_ids:
-        counts_result = await db.execute(
-            select(
-                EventRegistration.event_id,
-                func.count(EventRegistration.id).label("count"),
-            )
-            .where(EventRegistration.event_id.in_(event_ids))
-            .group_by(EventRegistration.event_id)
-        )
-        counts = {row.event_id: row.count for row in counts_result}
+    counts = {e.id: e.registration_count for e in events if e.registration_count}
 
     now_utc = datetime.now(timezone.utc)
 
@@ -173,6 +227,20 @@ async def events_list(
 
 # ── Create Event ────────────────────────────────────────────────────────────
 
+def _parse_dt(s: str):
+    """Parse a form datetime as UTC; `datetime-local` values (YYYY-MM-DDTHH:MM) skip fromisoformat."""
+    if not s:
+        return None
+    try:
+        if len(s) == 16 and s[4] == "-" and s[7] == "-" and s[10] == "T" and s[13] == ":":
+            return datetime(
+                int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]),
+                tzinfo=timezone.utc,
+            )
+        return datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
+    except ValueError:
+        return None
+
 
 @router.get("/events/new", response_class=HTMLResponse)
 async def new_event_form(
@@ -207,14 +275,6 @@ async def create_event_submit(
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    def parse_dt(s: str):
-        if not s:
-            return None
-        try:
-            return datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-        except ValueError:
-            return None
-
     event = await create_event(
         db,
         title=title,
@@ -222,10 +282,10 @@ async def create_event_submit(
         event_type=event_type,
         distance_category=distance_category or None,
         distance_km=distance_km or None,
-        starts_at=parse_dt(starts_at),
-        ends_at=parse_dt(ends_at),
-        registration_opens_at=parse_dt(registration_opens_at),
-        registration_closes_at=parse_dt(registration_closes_at),
+        starts_at=_parse_dt(starts_at),
+        ends_at=_parse_dt(ends_at),
+        registration_opens_at=_parse_dt(registration_opens_at),
+        registration_closes_at=_parse_dt(registration_closes_at),
         max_participants=max_participants or None,
         sponsor_name=sponsor_name or None,
         primary_color=primary_color or None,
@@ -243,11 +303,11 @@ async def create_event_submit(
 @router.get("/events/{event_id}/edit", response_class=HTMLResponse)
 async def edit_event_form(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Event).where(Event.id == uuid.UUID(event_id)))
+    result = await db.execute(_SELECT_EVENT, {"event_id": event_id})
     event = result.scalar_one_or_none()
     if event is None:
         return RedirectResponse(url="/admin/events", status_code=303)
@@ -263,7 +323,7 @@ async def edit_event_form(
 @router.post("/events/{event_id}", response_class=HTMLResponse)
 async def update_event_submit(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     title: str = Form(...),
     description: str = Form(""),
     event_type: str = Form(...),
@@ -282,26 +342,18 @@ async def update_event_submit(
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    def parse_dt(s: str):
-        if not s:
-            return None
-        try:
-            return datetime.fromisoformat(s).replace(tzinfo=timezone.utc)
-        except ValueError:
-            return None
-
     await update_event(
         db,
-        event_id=uuid.UUID(event_id),
+        event_id=event_id,
         title=title,
         description=description or None,
         event_type=event_type,
         distance_category=distance_category or None,
         distance_km=distance_km or None,
-        starts_at=parse_dt(starts_at),
-        ends_at=parse_dt(ends_at),
-        registration_opens_at=parse_dt(registration_opens_at),
-        registration_closes_at=parse_dt(registration_closes_at),
+        starts_at=_parse_dt(starts_at),
+        ends_at=_parse_dt(ends_at),
+        registration_opens_at=_parse_dt(registration_opens_at),
+        registration_closes_at=_parse_dt(registration_closes_at),
         max_participants=max_participants or None,
         sponsor_name=sponsor_name or None,
         primary_color=primary_color or None,
@@ -318,12 +370,12 @@ async def update_event_submit(
 
 @router.delete("/events/{event_id}", response_class=HTMLResponse)
 async def delete_event_endpoint(
-    event_id: str,
+    event_id: uuid.UUID,
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Delete associated images from R2
-    result = await db.execute(select(Event).where(Event.id == uuid.UUID(event_id)))
+    result = await db.execute(_SELECT_EVENT, {"event_id": event_id})
     event = result.scalar_one_or_none()
     if event:
         if event.sponsor_logo_url:
@@ -337,7 +389,7 @@ async def delete_event_endpoint(
             except Exception:
                 pass
 
-    await delete_event(db, uuid.UUID(event_id))
+    await delete_event(db, event_id)
     return HTMLResponse("")  # HTMX will remove the row
 
 
@@ -347,27 +399,29 @@ async def delete_event_endpoint(
 @router.post("/events/{event_id}/upload-logo", response_class=HTMLResponse)
 async def upload_logo(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     file: UploadFile = File(...),
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Event).where(Event.id == uuid.UUID(event_id)))
-    event = result.scalar_one_or_none()
-    if event is None:
+    # Only the current URL is needed; no Event instance is loaded
+    row = (await db.execute(select(Event.sponsor_logo_url).where(Event.id == event_id))).one_or_none()
+    if row is None:
         return HTMLResponse("Event not found", status_code=404)
 
     # Delete old logo
-    if event.sponsor_logo_url:
+    if row.sponsor_logo_url:
         try:
-            delete_file(event.sponsor_logo_url)
+            delete_file(row.sponsor_logo_url)
         except Exception:
             pass
 
-    file_bytes = await file.read()
-    url = upload_file(file_bytes, file.filename or "logo.png", file.content_type or "image/png", folder="events/logos")
+    await file.seek(0)
+    url = await run_in_threadpool(
+        upload_file, file.file, file.filename or "logo.png", file.content_type or "image/png", folder="events/logos"
+    )
 
-    event.sponsor_logo_url = url
+    await db.execute(update(Event).where(Event.id == event_id).values(sponsor_logo_url=url))
     await db.commit()
 
     return HTMLResponse(f'''
@@ -381,27 +435,29 @@ async def upload_logo(
 @router.post("/events/{event_id}/upload-banner", response_class=HTMLResponse)
 async def upload_banner(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     file: UploadFile = File(...),
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Event).where(Event.id == uuid.UUID(event_id)))
-    event = result.scalar_one_or_none()
-    if event is None:
+    # Only the current URL is needed; no Event instance is loaded
+    row = (await db.execute(select(Event.banner_image_url).where(Event.id == event_id))).one_or_none()
+    if row is None:
         return HTMLResponse("Event not found", status_code=404)
 
     # Delete old banner
-    if event.banner_image_url:
+    if row.banner_image_url:
         try:
-            delete_file(event.banner_image_url)
+            delete_file(row.banner_image_url)
         except Exception:
             pass
 
-    file_bytes = await file.read()
-    url = upload_file(file_bytes, file.filename or "banner.jpg", file.content_type or "image/jpeg", folder="events/banners")
+    await file.seek(0)
+    url = await run_in_threadpool(
+        upload_file, file.file, file.filename or "banner.jpg", file.content_type or "image/jpeg", folder="events/banners"
+    )
 
-    event.banner_image_url = url
+    await db.execute(update(Event).where(Event.id == event_id).values(banner_image_url=url))
     await db.commit()
 
     return HTMLResponse(f'''
@@ -418,58 +474,71 @@ async def upload_banner(
 @router.get("/events/{event_id}/detail", response_class=HTMLResponse)
 async def event_detail(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Event).where(Event.id == uuid.UUID(event_id)))
-    event = result.scalar_one_or_none()
-    if event is None:
+    """Event page with both tab panels rendered inline (no HTMX follow-up requests)."""
+    result = await db.execute(_SELECT_EVENT_WITH_COUNT, {"event_id": event_id})
+    row = result.one_or_none()
+    if row is None:
         return RedirectResponse(url="/admin/events", status_code=303)
+    event = row.Event
 
-    count_result = await db.execute(
-        select(func.count()).select_from(EventRegistration)
-        .where(EventRegistration.event_id == uuid.UUID(event_id))
-    )
-    registration_count = count_result.scalar() or 0
+    # One AsyncSession can't run statements concurrently, so these stay sequential
+    registrations = await get_event_registrations(db, event_id)
+    leaderboard = await get_event_leaderboard(db, event)
 
     return templates.TemplateResponse("admin/events/detail.html", {
         "request": request,
         "admin": admin,
         "event": event,
-        "registration_count": registration_count,
+        "registration_count": row.registration_count or 0,
+        "registrations": registrations,
+        "leaderboard": leaderboard,
     })
 
 
 @router.get("/events/{event_id}/registrations", response_class=HTMLResponse)
 async def event_registrations(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    registrations = await get_event_registrations(db, uuid.UUID(event_id))
+    registrations = await get_event_registrations(db, event_id)
     return templates.TemplateResponse("admin/events/_registrations.html", {
         "request": request,
         "registrations": registrations,
     })
 
 
+@router.get("/events/{event_id}/registrations.json", response_class=MsgspecJSONResponse)
+async def event_registrations_json(
+    event_id: uuid.UUID,
+    limit: int = 100,
+    offset: int = 0,
+    admin: User = Depends(get_admin_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """Registrations as JSON (for exports/scripts); same rows as the HTMX partial."""
+    registrations = await get_event_registrations(db, event_id, limit=limit, offset=offset)
+    return MsgspecJSONResponse(registrations)
+
+
 @router.get("/events/{event_id}/leaderboard", response_class=HTMLResponse)
 async def event_leaderboard(
     request: Request,
-    event_id: str,
+    event_id: uuid.UUID,
     admin: User = Depends(get_admin_user),
     db: AsyncSession = Depends(get_db),
 ):
-    result = await db.execute(select(Event).where(Event.id == uuid.UUID(event_id)))
+    result = await db.execute(_SELECT_EVENT, {"event_id": event_id})
     event = result.scalar_one_or_none()
-
-    from app.services.event_service import get_event_detail
-    detail = await get_event_detail(db, uuid.UUID(event_id), admin.id)
+    leaderboard = await get_event_leaderboard(db, event) if event else []
 
     return templates.TemplateResponse("admin/events/_leaderboard.html", {
         "request": request,
         "event": event,
-        "leaderboard": detail["leaderboard"] if detail else [],
+        "leaderboard": leaderboard,
     })
@@ -1,5 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy import select
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select, update, exists, or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
@@ -15,7 +16,7 @@ from app.models.auth_schemas import (
 )
 from app.services.auth_service import (
     hash_password,
-    verify_password,
+    verify_and_update_password,
     create_access_token,
     verify_google_token,
     verify_apple_token,
@@ -43,9 +44,9 @@ async def register_email(
     request: EmailRegisterRequest, db: AsyncSession = Depends(get_db)
 ):
     """Register a new user with email and password."""
-    # Check if email already exists
-    result = await db.execute(select(User).where(User.email == request.email))
-    if result.scalar_one_or_none() is not None:
+    # Check if email already exists (an index probe on ix_users_email; no row is loaded)
+    email_taken = await db.scalar(select(exists().where(User.email == request.email)))
+    if email_taken:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="An account with this email already exists",
@@ -55,11 +56,10 @@ async def register_email(
         email=request.email,
         name=request.name,
         auth_provider="email",
-        hashed_password=hash_password(request.password),
+        hashed_password=await run_in_threadpool(hash_password, request.password),
     )
     db.add(user)
     await db.flush()
-    await db.refresh(user)
 
     uid = str(user.id)
     analytics.capture(uid, "user_signed_up", {"auth_provider": "email"})
@@ -82,11 +82,18 @@ async def login_email(
             detail="Invalid email or password",
         )
 
-    if not verify_password(request.password, user.hashed_password):
+    # The KDF runs in a worker thread (argon2 releases the GIL) so logins don't stall the loop
+    valid, new_hash = await run_in_threadpool(
+        verify_and_update_password, request.password, user.hashed_password
+    )
+    if not valid:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid email or password",
         )
+    if new_hash:
+        # Upgrade legacy bcrypt hashes to argon2id on successful login
+        user.hashed_password = new_hash
 
     analytics.capture(str(user.id), "user_signed_in", {"auth_provider": "email"})
 
@@ -117,7 +124,6 @@ async def auth_google(
         )
         db.add(user)
         await db.flush()
-        await db.refresh(user)
 
     uid = str(user.id)
     if is_new_user:
@@ -139,20 +145,20 @@ async def auth_apple(
     """Sign in or register with Apple."""
     apple_info = await verify_apple_token(request.identity_token)
 
-    # Try to find by Apple user identifier first (most reliable)
-    result = await db.execute(
-        select(User).where(User.apple_user_identifier == request.user_identifier)
-    )
+    # Find by Apple user identifier (most reliable) or, failing that, by email
+    # (Apple provides email on first sign-in only), in one round-trip
+    email = request.email or apple_info.get("email")
+    apple_match = User.apple_user_identifier == request.user_identifier
+    query = select(User)
+    if email:
+        query = query.where(or_(apple_match, User.email == email)).order_by(apple_match.desc().nulls_last()).limit(1)
+    else:
+        query = query.where(apple_match)
+    result = await db.execute(query)
     user = result.scalar_one_or_none()
 
     is_new_user = False
-    if user is None:
-        # Try by email (Apple provides email on first sign-in only)
-        email = request.email or apple_info.get("email")
-        if email:
-            result = await db.execute(select(User).where(User.email == email))
-            user = result.scalar_one_or_none()
-
+    if user is None or user.apple_user_identifier != request.user_identifier:
         if user is None:
             is_new_user = True
             # Create new user
@@ -167,7 +173,6 @@ async def auth_apple(
             )
             db.add(user)
             await db.flush()
-            await db.refresh(user)
         else:
             # Link Apple identifier to existing email account
             user.apple_user_identifier = request.user_identifier
@@ -200,32 +205,27 @@ async def update_profile(
     """Update profile fields. Sets has_completed_profile when key fields are filled."""
     was_complete = current_user.has_completed_profile
 
-    if request.name is not None:
-        current_user.name = request.name
-    if request.date_of_birth is not None:
-        current_user.date_of_birth = request.date_of_birth
-    if request.gender is not None:
-        current_user.gender = request.gender
-    if request.height_cm is not None:
-        current_user.height_cm = request.height_cm
-    if request.profile_photo_base64 is not None:
-        current_user.profile_photo_base64 = request.profile_photo_base64
-    if request.leaderboard_opt_in is not None:
-        current_user.leaderboard_opt_in = request.leaderboard_opt_in
-    if request.display_name is not None:
-        current_user.display_name = request.display_name
+    # Only fields the client actually sent (null means "leave unchanged")
+    changes = request.model_dump(exclude_none=True)
 
     # Mark profile as complete if key fields are filled
-    if all([
-        current_user.name,
-        current_user.date_of_birth,
-        current_user.gender,
-        current_user.height_cm is not None,
+    merged = {
+        key: changes.get(key, getattr(current_user, key))
+        for key in ("name", "date_of_birth", "gender", "height_cm")
+    }
+    if not was_complete and all([
+        merged["name"],
+        merged["date_of_birth"],
+        merged["gender"],
+        merged["height_cm"] is not None,
     ]):
-        current_user.has_completed_profile = True
+        changes["has_completed_profile"] = True
 
-    await db.flush()
-    await db.refresh(current_user)
+    if changes:
+        # One UPDATE ... RETURNING; the ORM refreshes current_user in place from the returned row
+        await db.execute(
+            update(User).where(User.id == current_user.id).values(**changes).returning(User)
+        )
 
     uid = str(current_user.id)
     if not was_complete and current_user.has_completed_profile:
@@ -1,15 +1,17 @@
+import uuid
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, update
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy import select, update, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from fastapi import HTTPException, Path
 
 from app.database import get_db
 from app.models.user import User
-from app.models.achievement import AchievementDefinition, UserAchievement
+from app.models.achievement import UserAchievement
 from app.models.streak import UserStreak
+from app.responses import MsgspecJSONResponse
 from app.models.community_schemas import (
     LeaderboardResponse,
     AchievementDefinitionResponse,
@@ -23,9 +25,15 @@ from app.models.community_schemas import (
     EventRegistrationResponse,
 )
 from app.services.auth_service import get_current_user
+from app.services.achievement_service import (
+    get_achievement_definitions,
+    get_achievement_definitions_json,
+    user_achievements_to_dicts,
+)
 from app.services.leaderboard_service import (
     get_yearly_distance_leaderboard,
     get_best_time_leaderboard,
+    decode_leaderboard_cursor,
 )
 from app.services.challenge_service import (
     get_challenges_list,
@@ -49,6 +57,7 @@ async def yearly_distance_leaderboard(
     offset: int = Query(0, ge=0),
     gender: str | None = Query(None, description="Filter by gender: male, female"),
     age_group: str | None = Query(None, description="Filter by age group: 18-29, 30-39, 40-49, 50-59, 60+"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (overrides offset)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
@@ -56,6 +65,11 @@ async def yearly_distance_leaderboard(
     if year is None:
         year = date.today().year
 
+    try:
+        after = decode_leaderboard_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     result = await get_yearly_distance_leaderboard(
         db=db,
         user_id=current_user.id,
@@ -64,8 +78,9 @@ async def yearly_distance_leaderboard(
         offset=offset,
         gender=gender,
         age_group=age_group,
+        after=after,
     )
-    return LeaderboardResponse(**result)
+    return MsgspecJSONResponse(result)
 
 
 @router.get("/leaderboards/best-time", response_model=LeaderboardResponse)
@@ -75,10 +90,16 @@ async def best_time_leaderboard(
     offset: int = Query(0, ge=0),
     gender: str | None = Query(None, description="Filter by gender: male, female"),
     age_group: str | None = Query(None, description="Filter by age group: 18-29, 30-39, 40-49, 50-59, 60+"),
+    cursor: str | None = Query(None, description="next_cursor from the previous page (overrides offset)"),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Best time leaderboard for a distance category (from personal bests)."""
+    try:
+        after = decode_leaderboard_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
     result = await get_best_time_leaderboard(
         db=db,
         user_id=current_user.id,
@@ -87,23 +108,46 @@ async def best_time_leaderboard(
         offset=offset,
         gender=gender,
         age_group=age_group,
+        after=after,
     )
-    return LeaderboardResponse(**result)
+    return MsgspecJSONResponse(result)
 
 
 # ── Achievements ─────────────────────────────────────────────────────────────
 
 
+# The catalog is the same for every user and only changes on a deploy's reseed
+_ACHIEVEMENTS_CACHE_CONTROL = "public, max-age=3600"
+
+
 @router.get("/achievements", response_model=list[AchievementDefinitionResponse])
 async def get_achievements(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get all achievement definitions."""
-    result = await db.execute(
-        select(AchievementDefinition).order_by(AchievementDefinition.sort_order)
-    )
-    return [AchievementDefinitionResponse.model_validate(d) for d in result.scalars().all()]
+    # Pre-encoded once per process from the definition cache; clients revalidate by ETag
+    body, etag = await get_achievement_definitions_json(db)
+    headers = {"ETag": etag, "Cache-Control": _ACHIEVEMENTS_CACHE_CONTROL}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+# Unlock rows only (index-only on ix_user_achievements_user / _unnotified); the
+# definition fields come from the in-process definition cache
+_USER_ACHIEVEMENT_COLUMNS = (UserAchievement.achievement_id, UserAchievement.unlocked_at, UserAchievement.run_id)
+_MY_ACHIEVEMENTS = (
+    select(*_USER_ACHIEVEMENT_COLUMNS)
+    .where(UserAchievement.user_id == bindparam("user_id"))
+    .order_by(UserAchievement.unlocked_at.desc())
+)
+_UNNOTIFIED_ACHIEVEMENTS = (
+    select(*_USER_ACHIEVEMENT_COLUMNS)
+    .where(UserAchievement.user_id == bindparam("user_id"), UserAchievement.notified == False)
+    .order_by(UserAchievement.unlocked_at.desc())
+)
 
 
 @router.get("/achievements/mine", response_model=list[UserAchievementResponse])
@@ -112,34 +156,10 @@ async def get_my_achievements(
     db: AsyncSession = Depends(get_db),
 ):
     """Get the current user's unlocked achievements with definition details."""
-    result = await db.execute(
-        select(
-            UserAchievement.achievement_id,
-            UserAchievement.unlocked_at,
-            UserAchievement.run_id,
-            AchievementDefinition.category,
-            AchievementDefinition.title,
-            AchievementDefinition.description,
-            AchievementDefinition.icon,
-            AchievementDefinition.tier,
-        )
-        .join(AchievementDefinition, UserAchievement.achievement_id == AchievementDefinition.id)
-        .where(UserAchievement.user_id == current_user.id)
-        .order_by(UserAchievement.unlocked_at.desc())
-    )
-    return [
-        UserAchievementResponse(
-            achievement_id=row.achievement_id,
-            unlocked_at=row.unlocked_at,
-            run_id=row.run_id,
-            category=row.category,
-            title=row.title,
-            description=row.description,
-            icon=row.icon,
-            tier=row.tier,
-        )
-        for row in result
-    ]
+    rows = (await db.execute(_MY_ACHIEVEMENTS, {"user_id": current_user.id})).all()
+    # Reloads the definition cache if another worker seeded ids this one hasn't seen
+    definitions = await get_achievement_definitions(db, {row.achievement_id for row in rows})
+    return MsgspecJSONResponse(user_achievements_to_dicts(rows, definitions))
 
 
 @router.get("/achievements/unnotified", response_model=list[UserAchievementResponse])
@@ -148,37 +168,10 @@ async def get_unnotified_achievements(
     db: AsyncSession = Depends(get_db),
 ):
     """Get achievements the user hasn't been notified about yet."""
-    result = await db.execute(
-        select(
-            UserAchievement.achievement_id,
-            UserAchievement.unlocked_at,
-            UserAchievement.run_id,
-            AchievementDefinition.category,
-            AchievementDefinition.title,
-            AchievementDefinition.description,
-            AchievementDefinition.icon,
-            AchievementDefinition.tier,
-        )
-        .join(AchievementDefinition, UserAchievement.achievement_id == AchievementDefinition.id)
-        .where(
-            UserAchievement.user_id == current_user.id,
-            UserAchievement.notified == "false",
-        )
-        .order_by(UserAchievement.unlocked_at.desc())
-    )
-    return [
-        UserAchievementResponse(
-            achievement_id=row.achievement_id,
-            unlocked_at=row.unlocked_at,
-            run_id=row.run_id,
-            category=row.category,
-            title=row.title,
-            description=row.description,
-            icon=row.icon,
-            tier=row.tier,
-        )
-        for row in result
-    ]
+    rows = (await db.execute(_UNNOTIFIED_ACHIEVEMENTS, {"user_id": current_user.id})).all()
+    # Reloads the definition cache if another worker seeded ids this one hasn't seen
+    definitions = await get_achievement_definitions(db, {row.achievement_id for row in rows})
+    return MsgspecJSONResponse(user_achievements_to_dicts(rows, definitions))
 
 
 @router.post("/achievements/mark-notified")
@@ -188,17 +181,20 @@ async def mark_achievements_notified(
     db: AsyncSession = Depends(get_db),
 ):
     """Mark achievements as notified (user has seen the celebration)."""
-    if request.achievement_ids:
-        await db.execute(
-            update(UserAchievement)
-            .where(
-                UserAchievement.user_id == current_user.id,
-                UserAchievement.achievement_id.in_(request.achievement_ids),
-            )
-            .values(notified="true")
+    if not request.achievement_ids:
+        return {"marked": 0}
+    # Already-notified rows are left alone; get_db commits on return
+    result = await db.execute(
+        update(UserAchievement)
+        .where(
+            UserAchievement.user_id == current_user.id,
+            UserAchievement.achievement_id.in_(request.achievement_ids),
+            UserAchievement.notified == False,
         )
-        await db.commit()
-    return {"marked": len(request.achievement_ids)}
+        .values(notified=True)
+        .execution_options(synchronize_session=False)
+    )
+    return {"marked": result.rowcount}
 
 
 @router.get("/streak", response_model=UserStreakResponse)
@@ -239,44 +235,32 @@ async def list_challenges(
     return [ChallengeResponse(**r) for r in results]
 
 
-@router.get("/challenges/{challenge_id}", response_model=ChallengeDetailResponse)
+@router.get("/challenges/{challenge_id:uuid}", response_model=ChallengeDetailResponse)
 async def challenge_detail(
-    challenge_id: str = Path(...),
+    challenge_id: uuid.UUID = Path(...),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get challenge detail with leaderboard."""
-    import uuid as _uuid
-    try:
-        cid = _uuid.UUID(challenge_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid challenge ID")
-
     result = await get_challenge_detail(
-        db=db, challenge_id=cid, user_id=current_user.id,
+        db=db, challenge_id=challenge_id, user_id=current_user.id,
         limit=limit, offset=offset,
     )
     if result is None:
         raise HTTPException(status_code=404, detail="Challenge not found")
-    return ChallengeDetailResponse(**result)
+    return MsgspecJSONResponse(result)
 
 
-@router.post("/challenges/{challenge_id}/join")
+@router.post("/challenges/{challenge_id:uuid}/join")
 async def join_challenge_endpoint(
-    challenge_id: str = Path(...),
+    challenge_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Join a challenge."""
-    import uuid as _uuid
-    try:
-        cid = _uuid.UUID(challenge_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid challenge ID")
-
-    newly_joined = await join_challenge(db=db, user_id=current_user.id, challenge_id=cid)
+    newly_joined = await join_challenge(db=db, user_id=current_user.id, challenge_id=challenge_id)
     return {"joined": newly_joined}
 
 
@@ -314,61 +298,43 @@ async def list_events(
     return [EventResponse(**r) for r in results]
 
 
-@router.get("/events/{event_id}", response_model=EventDetailResponse)
+@router.get("/events/{event_id:uuid}", response_model=EventDetailResponse)
 async def event_detail(
-    event_id: str = Path(...),
+    event_id: uuid.UUID = Path(...),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get event detail with leaderboard."""
-    import uuid as _uuid
-    try:
-        eid = _uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID")
-
     result = await get_event_detail(
-        db=db, event_id=eid, user_id=current_user.id,
+        db=db, event_id=event_id, user_id=current_user.id,
         limit=limit, offset=offset,
     )
     if result is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    return EventDetailResponse(**result)
+    return MsgspecJSONResponse(result)
 
 
-@router.post("/events/{event_id}/register", response_model=EventRegistrationResponse)
+@router.post("/events/{event_id:uuid}/register", response_model=EventRegistrationResponse)
 async def register_event(
-    event_id: str = Path(...),
+    event_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Register for an event."""
-    import uuid as _uuid
-    try:
-        eid = _uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID")
-
-    result = await register_for_event(db=db, user_id=current_user.id, event_id=eid)
+    result = await register_for_event(db=db, user_id=current_user.id, event_id=event_id)
     if "error" in result:
         raise HTTPException(status_code=400, detail=result["error"])
     return EventRegistrationResponse(**result)
 
 
-@router.delete("/events/{event_id}/register")
+@router.delete("/events/{event_id:uuid}/register")
 async def unregister_event(
-    event_id: str = Path(...),
+    event_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Unregister from an event."""
-    import uuid as _uuid
-    try:
-        eid = _uuid.UUID(event_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid event ID")
-
-    removed = await unregister_from_event(db=db, user_id=current_user.id, event_id=eid)
+    removed = await unregister_from_event(db=db, user_id=current_user.id, event_id=event_id)
     return {"unregistered": removed}
@@ -1,11 +1,13 @@
-import json
+import asyncio
+from typing import AsyncIterator
 
+import msgspec
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.responses import StreamingResponse
 
 from app.models.schemas import TrainingPlanRequest, PlanEditRequest, PerformanceAnalysisRequest, ConflictAnalysisResponse
 from app.models.user import User
-from app.services.anthropic_client import AnthropicClient
+from app.services.anthropic_client import AnthropicClient, get_anthropic_client
 from app.services.prompt_builder import prompt_builder
 from app.services.conflict_analyzer import conflict_analyzer
 from app.services.auth_service import get_current_user
@@ -14,6 +16,101 @@ from app.services import analytics
 
 router = APIRouter(prefix="/api", tags=["plans"])
 
+# SSE frames are yielded as bytes, which StreamingResponse passes straight to ASGI
+# as one body message each (flushed immediately); the closing frame never changes
+_json_encode = msgspec.json.Encoder().encode
+
+
+def _sse_frame(payload: dict) -> bytes:
+    return b"data: " + _json_encode(payload) + b"\n\n"
+
+
+def _sse_content_frame(chunk: str) -> bytes:
+    # Per-token hot path: only the text itself needs escaping
+    return b'data: {"content":' + _json_encode(chunk) + b"}\n\n"
+
+
+_SSE_DONE = _sse_frame({"done": True})
+
+# Upstream text chunks that may be read ahead of a slow client
+_STREAM_BUFFER_CHUNKS = 32
+# Chunks arriving within this window of each other go out as one SSE frame
+_STREAM_COALESCE_SECONDS = 0.025
+_STREAM_END = object()
+
+
+async def _buffered(stream: AsyncIterator[str]) -> AsyncIterator[str]:
+    """Read `stream` in a background task through a bounded queue.
+
+    The model stream keeps being drained while the client is slow to receive (up to
+    the buffer size), and vice versa. After the first chunk, which is passed on at
+    once, chunks are joined over a short window so a fast model costs one frame per
+    window rather than one per token. Upstream errors are re-raised to the caller
+    after the text before them; closing the iterator (client disconnect) cancels the read.
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=_STREAM_BUFFER_CHUNKS)
+
+    async def produce():
+        try:
+            async for item in stream:
+                await queue.put(item)
+        except Exception as e:
+            await queue.put(e)
+        else:
+            await queue.put(_STREAM_END)
+
+    task = asyncio.create_task(produce())
+    loop = asyncio.get_running_loop()
+    try:
+        item = await queue.get()
+        if isinstance(item, str):
+            yield item
+            item = await queue.get()
+
+        while isinstance(item, str):
+            batch = [item]
+            item = None
+            deadline = loop.time() + _STREAM_COALESCE_SECONDS
+            while (timeout := deadline - loop.time()) > 0:
+                try:
+                    item = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    item = None
+                    break
+                if not isinstance(item, str):
+                    break
+                batch.append(item)
+                item = None
+            yield "".join(batch)
+            if item is None:
+                item = await queue.get()
+
+        if isinstance(item, Exception):
+            raise item
+    finally:
+        task.cancel()
+
+
+_SSE_HEADERS = {
+    "Cache-Control": "no-cache",
+    "Connection": "keep-alive",
+    "X-Accel-Buffering": "no",
+}
+
+
+async def _sse_frames(stream: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in _buffered(stream):
+            yield _sse_content_frame(chunk)
+        yield _SSE_DONE
+    except Exception as e:
+        yield _sse_frame({"error": str(e)})
+
+
+def _sse_response(stream: AsyncIterator[str]) -> StreamingResponse:
+    """Stream model text chunks to the client as SSE content frames, then a done (or error) frame."""
+    return StreamingResponse(_sse_frames(stream), media_type="text/event-stream", headers=_SSE_HEADERS)
+
 
 @router.post("/analyze-conflicts", response_model=ConflictAnalysisResponse)
 async def analyze_conflicts(request: TrainingPlanRequest, current_user: User = Depends(get_current_user)) -> ConflictAnalysisResponse:
@@ -37,7 +134,11 @@ async def analyze_conflicts(request: TrainingPlanRequest, current_user: User = D
 
 
 @router.post("/generate-plan")
-async def generate_training_plan(request: TrainingPlanRequest, current_user: User = Depends(get_current_user)):
+async def generate_training_plan(
+    request: TrainingPlanRequest,
+    current_user: User = Depends(get_current_user),
+    client: AnthropicClient = Depends(get_anthropic_client),
+):
     """
     Generate a personalized training plan based on the athlete's profile.
 
@@ -59,7 +160,6 @@ async def generate_training_plan(request: TrainingPlanRequest, current_user: Use
     system_prompt = prompt_builder.get_system_prompt(request.race_type, request.custom_distance_km)
     user_prompt = prompt_builder.build_user_prompt(request)
 
-    client = AnthropicClient()
     user_id_str = str(current_user.id)
     session_id = f"user:{user_id_str}:plan:{request.race_type.value}:{request.race_date}"
 
@@ -69,34 +169,22 @@ async def generate_training_plan(request: TrainingPlanRequest, current_user: Use
         "plan_mode": request.plan_mode.value if request.plan_mode else None,
     })
 
-    async def generate():
-        try:
-            async for chunk in client.generate_plan_stream(
-                system_prompt,
-                user_prompt,
-                name="generate-plan",
-                user_id=user_id_str,
-                session_id=session_id,
-                metadata={"race_type": request.race_type.value, "fitness_level": request.fitness_level.value},
-            ):
-                yield f"data: {json.dumps({'content': chunk})}\n\n"
-            yield f"data: {json.dumps({'done': True})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
-    )
+    return _sse_response(client.generate_plan_stream(
+        system_prompt,
+        user_prompt,
+        name="generate-plan",
+        user_id=user_id_str,
+        session_id=session_id,
+        metadata={"race_type": request.race_type.value, "fitness_level": request.fitness_level.value},
+    ))
 
 
 @router.post("/edit-plan")
-async def edit_training_plan(request: PlanEditRequest, current_user: User = Depends(get_current_user)):
+async def edit_training_plan(
+    request: PlanEditRequest,
+    current_user: User = Depends(get_current_user),
+    client: AnthropicClient = Depends(get_anthropic_client),
+):
     """
     Edit an existing training plan based on natural language instructions.
 
@@ -117,7 +205,6 @@ async def edit_training_plan(request: PlanEditRequest, current_user: User = Depe
     system_prompt = prompt_builder.get_edit_system_prompt(request.race_type, request.custom_distance_km)
     user_prompt = prompt_builder.build_edit_user_prompt(request)
 
-    client = AnthropicClient()
     user_id_str = str(current_user.id)
     session_id = f"user:{user_id_str}:plan:{request.race_type.value}:{request.race_date}"
 
@@ -125,34 +212,22 @@ async def edit_training_plan(request: PlanEditRequest, current_user: User = Depe
         "race_type": request.race_type.value,
     })
 
-    async def generate():
-        try:
-            async for chunk in client.generate_plan_stream(
-                system_prompt,
-                user_prompt,
-                name="edit-plan",
-                user_id=user_id_str,
-                session_id=session_id,
-                metadata={"race_type": request.race_type.value},
-            ):
-                yield f"data: {json.dumps({'content': chunk})}\n\n"
-            yield f"data: {json.dumps({'done': True})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
-    )
+    return _sse_response(client.generate_plan_stream(
+        system_prompt,
+        user_prompt,
+        name="edit-plan",
+        user_id=user_id_str,
+        session_id=session_id,
+        metadata={"race_type": request.race_type.value},
+    ))
 
 
 @router.post("/analyze-performance")
-async def analyze_performance(request: PerformanceAnalysisRequest, current_user: User = Depends(get_current_user)):
+async def analyze_performance(
+    request: PerformanceAnalysisRequest,
+    current_user: User = Depends(get_current_user),
+    client: AnthropicClient = Depends(get_anthropic_client),
+):
     """
     Analyze an athlete's training performance against their plan.
 
@@ -173,7 +248,6 @@ async def analyze_performance(request: PerformanceAnalysisRequest, current_user:
     system_prompt = prompt_builder.get_analysis_system_prompt(request.race_type, request.custom_distance_km)
     user_prompt = prompt_builder.build_analysis_user_prompt(request)
 
-    client = AnthropicClient()
     user_id_str = str(current_user.id)
     session_id = f"user:{user_id_str}:plan:{request.race_type.value}:{request.race_date}"
 
@@ -183,30 +257,14 @@ async def analyze_performance(request: PerformanceAnalysisRequest, current_user:
         "total_workouts": len(request.completed_workouts),
     })
 
-    async def generate():
-        try:
-            async for chunk in client.generate_plan_stream(
-                system_prompt,
-                user_prompt,
-                name="analyze-performance",
-                user_id=user_id_str,
-                session_id=session_id,
-                metadata={
-                    "race_type": request.race_type.value,
-                    "weeks_into_plan": request.weeks_into_plan,
-                },
-            ):
-                yield f"data: {json.dumps({'content': chunk})}\n\n"
-            yield f"data: {json.dumps({'done': True})}\n\n"
-        except Exception as e:
-            yield f"data: {json.dumps({'error': str(e)})}\n\n"
-
-    return StreamingResponse(
-        generate(),
-        media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Accel-Buffering": "no"
-        }
-    )
+    return _sse_response(client.generate_plan_stream(
+        system_prompt,
+        user_prompt,
+        name="analyze-performance",
+        user_id=user_id_str,
+        session_id=session_id,
+        metadata={
+            "race_type": request.race_type.value,
+            "weeks_into_plan": request.weeks_into_plan,
+        },
+    ))
@@ -1,7 +1,11 @@
-from datetime import datetime, timezone
-
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy import select, func
+import base64
+import uuid
+from collections import defaultdict
+from datetime import datetime
+
+import msgspec
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy import select, func, tuple_
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,7 +16,9 @@ from app.models.community_schemas import (
     RunBatchSyncRequest,
     RunBatchSyncResponse,
     RunResponse,
+    RUN_RESPONSE_LIST_ADAPTER,
 )
+from app.responses import MsgspecJSONResponse
 from app.services.auth_service import get_current_user
 from app.services.leaderboard_service import compute_personal_bests
 from app.services.achievement_service import check_achievements_after_sync
@@ -20,10 +26,30 @@ from app.services.challenge_service import check_challenge_participation
 from app.services.event_service import check_event_participation
 from app.services import analytics
 from app.services.social_service import log_activity
-from app.services.shoe_service import add_mileage as shoe_add_mileage
+from app.services.shoe_service import add_mileage_bulk as shoe_add_mileage_bulk
 
 router = APIRouter(prefix="/api/runs", tags=["runs"])
 
+# Rows per INSERT statement; keeps bind params well under Postgres' 32767 limit
+SYNC_INSERT_CHUNK = 500
+
+# Only the RunResponse columns; rows skip ORM identity-map and change-tracking setup
+_RUN_RESPONSE_COLUMNS = tuple(getattr(Run, field) for field in RunResponse.model_fields)
+
+
+def _encode_runs_cursor(completed_at: datetime, run_id: uuid.UUID) -> str:
+    """Opaque keyset cursor: the last run's completed_at and id."""
+    return base64.urlsafe_b64encode(msgspec.json.encode([completed_at.isoformat(), str(run_id)])).decode()
+
+
+def _decode_runs_cursor(cursor: str) -> tuple[datetime, uuid.UUID]:
+    """(completed_at, run_id) from an X-Next-Cursor; raises ValueError if malformed."""
+    try:
+        completed_at, run_id = msgspec.json.decode(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(completed_at), uuid.UUID(run_id)
+    except (msgspec.MsgspecError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
 
 @router.post("/sync", response_model=RunBatchSyncResponse)
 async def sync_runs(
@@ -35,85 +61,64 @@ async def sync_runs(
     if not request.runs:
         return RunBatchSyncResponse(synced_count=0, already_existed=0, newly_unlocked=[])
 
-    now = datetime.now(timezone.utc)
-    synced_count = 0
-    all_newly_unlocked = []
+    rows = [
+        {
+            **run_payload.model_dump(),
+            "user_id": current_user.id,
+            "is_leaderboard_eligible": run_payload.data_source == "bluetooth_ftms",
+        }
+        for run_payload in request.runs
+    ]
+
+    # One multi-row INSERT per chunk; RETURNING yields only the ids actually inserted
+    inserted_ids = set()
+    for i in range(0, len(rows), SYNC_INSERT_CHUNK):
+        result = await db.execute(
+            pg_insert(Run)
+            .values(rows[i:i + SYNC_INSERT_CHUNK])
+            .on_conflict_do_nothing(constraint="runs_pkey")
+            .returning(Run.id)
+        )
+        inserted_ids.update(result.scalars())
+
+    synced_count = len(inserted_ids)
+    new_runs = []
+    # Summed per shoe so a batch on one pair is a single increment
+    mileage: defaultdict = defaultdict(float)
 
     for run_payload in request.runs:
+        if run_payload.id not in inserted_ids:
+            continue
+        # Guard against the same id appearing twice in one batch
+        inserted_ids.discard(run_payload.id)
+        new_runs.append(run_payload)
         is_eligible = run_payload.data_source == "bluetooth_ftms"
 
-        stmt = pg_insert(Run).values(
-            id=run_payload.id,
+        # Compute personal bests for newly synced eligible runs
+        await compute_personal_bests(
+            db=db,
             user_id=current_user.id,
-            completed_at=run_payload.completed_at,
-            distance_km=run_payload.distance_km,
-            duration_seconds=run_payload.duration_seconds,
-            avg_pace_sec_per_km=run_payload.avg_pace_sec_per_km,
+            run_id=run_payload.id,
             km_splits_json=run_payload.km_splits_json,
-            feedback_rating=run_payload.feedback_rating,
-            notes=run_payload.notes,
-            planned_workout_title=run_payload.planned_workout_title,
-            planned_workout_type=run_payload.planned_workout_type,
-            planned_distance_km=run_payload.planned_distance_km,
-            completion_score=run_payload.completion_score,
-            plan_name=run_payload.plan_name,
-            week_number=run_payload.week_number,
-            data_source=run_payload.data_source,
-            treadmill_brand=run_payload.treadmill_brand,
-            shoe_id=run_payload.shoe_id,
-            is_leaderboard_eligible=is_eligible,
-            synced_at=now,
-        ).on_conflict_do_nothing(index_elements=["id"])
-
-        result = await db.execute(stmt)
-        if result.rowcount > 0:
-            synced_count += 1
-            # Compute personal bests for newly synced eligible runs
-            await compute_personal_bests(
-                db=db,
-                user_id=current_user.id,
-                run_id=run_payload.id,
-                km_splits_json=run_payload.km_splits_json,
-                completed_at=run_payload.completed_at,
-                is_eligible=is_eligible,
-            )
-            # Check challenge participations
-            await check_challenge_participation(
-                db=db,
-                user_id=current_user.id,
-                run_id=run_payload.id,
-                distance_km=run_payload.distance_km,
-                km_splits_json=run_payload.km_splits_json,
-                completed_at=run_payload.completed_at,
-                is_eligible=is_eligible,
-            )
-            # Check event participations
-            await check_event_participation(
-                db=db,
-                user_id=current_user.id,
-                run_id=run_payload.id,
-                distance_km=run_payload.distance_km,
-                km_splits_json=run_payload.km_splits_json,
-                completed_at=run_payload.completed_at,
-                is_eligible=is_eligible,
-            )
-            # Increment shoe mileage
-            if run_payload.shoe_id:
-                await shoe_add_mileage(db, run_payload.shoe_id, current_user.id, run_payload.distance_km)
-            # Log activity for feed
-            await log_activity(
-                db, current_user.id, "run", run_payload.id,
-                {"distance_km": run_payload.distance_km, "duration_seconds": run_payload.duration_seconds},
-            )
-            # Check for newly unlocked achievements
-            unlocked = await check_achievements_after_sync(
-                db=db,
-                user_id=current_user.id,
-                run_id=run_payload.id,
-                distance_km=run_payload.distance_km,
-                completed_at=run_payload.completed_at,
-            )
-            all_newly_unlocked.extend(unlocked)
+            completed_at=run_payload.completed_at,
+            is_eligible=is_eligible,
+        )
+        if run_payload.shoe_id:
+            mileage[run_payload.shoe_id] += run_payload.distance_km
+        # Log activity for feed
+        await log_activity(
+            db, current_user.id, "run", run_payload.id,
+            {"distance_km": run_payload.distance_km, "duration_seconds": run_payload.duration_seconds},
+        )
+
+    # Challenges, events and achievements are each checked once for the whole batch
+    eligible_runs = [run for run in new_runs if run.data_source == "bluetooth_ftms"]
+    await check_challenge_participation(db, current_user.id, eligible_runs)
+    await check_event_participation(db, current_user.id, eligible_runs)
+    # Increment shoe mileage
+    await shoe_add_mileage_bulk(db, current_user.id, mileage)
+    # Check for newly unlocked achievements
+    all_newly_unlocked = await check_achievements_after_sync(db, current_user.id, new_runs)
 
     already_existed = len(request.runs) - synced_count
 
@@ -123,29 +128,50 @@ async def sync_runs(
         {"synced_count": synced_count, "already_existed": already_existed, "achievements_unlocked": len(all_newly_unlocked)},
     )
 
-    return RunBatchSyncResponse(
-        synced_count=synced_count,
-        already_existed=already_existed,
-        newly_unlocked=all_newly_unlocked,
-    )
+    return MsgspecJSONResponse({
+        "synced_count": synced_count,
+        "already_existed": already_existed,
+        "newly_unlocked": all_newly_unlocked,
+    })
 
 
 @router.get("", response_model=list[RunResponse])
 async def get_runs(
     since: datetime | None = Query(None, description="Only return runs completed after this timestamp"),
+    before: str | None = Query(None, description="X-Next-Cursor from the previous page (overrides offset)"),
     limit: int = Query(50, ge=1, le=200),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Get the current user's synced runs, ordered by completed_at descending."""
-    query = select(Run).where(Run.user_id == current_user.id)
+    """
+    Get the current user's synced runs, ordered by completed_at descending.
+    A full page sets X-Next-Cursor; pass it back as `before` to seek straight to
+    the next page instead of paying for a deep offset.
+    """
+    query = select(*_RUN_RESPONSE_COLUMNS).where(Run.user_id == current_user.id)
 
     if since is not None:
         query = query.where(Run.completed_at > since)
-
-    query = query.order_by(Run.completed_at.desc()).limit(limit).offset(offset)
+    if before is not None:
+        try:
+            after_completed_at, after_id = _decode_runs_cursor(before)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        # id breaks ties so runs sharing a completed_at are neither skipped nor repeated
+        query = query.where(tuple_(Run.completed_at, Run.id) < (after_completed_at, after_id))
+    else:
+        query = query.offset(offset)
+
+    query = query.order_by(Run.completed_at.desc(), Run.id.desc()).limit(limit)
 
     result = await db.execute(query)
-    runs = result.scalars().all()
-    return [RunResponse.model_validate(r) for r in runs]
+    runs = result.all()
+    # Validate and serialize the whole page in one pass each; returning a Response
+    # skips FastAPI re-validating the list against response_model
+    payload = RUN_RESPONSE_LIST_ADAPTER.validate_python(runs, from_attributes=True)
+    headers = (
+        {"X-Next-Cursor": _encode_runs_cursor(runs[-1].completed_at, runs[-1].id)}
+        if len(runs) == limit else None
+    )
+    return Response(RUN_RESPONSE_LIST_ADAPTER.dump_json(payload), media_type="application/json", headers=headers)
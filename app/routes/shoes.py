@@ -1,9 +1,16 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
+import uuid
+
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
-from app.models.shoe_schemas import ShoeCreateRequest, ShoeUpdateRequest, ShoeResponse
+from app.models.shoe_schemas import (
+    ShoeCreateRequest,
+    ShoeUpdateRequest,
+    ShoeResponse,
+    shoes_to_json,
+)
 from app.services.auth_service import get_current_user
 from app.services import shoe_service
 
@@ -17,7 +24,8 @@ async def list_shoes(
     db: AsyncSession = Depends(get_db),
 ):
     shoes = await shoe_service.get_user_shoes(db, current_user.id, include_retired)
-    return [ShoeResponse.model_validate(s) for s in shoes]
+    # Columns are already typed by the ORM; encode them directly and skip re-validation
+    return Response(shoes_to_json(shoes), media_type="application/json")
 
 
 @router.post("", response_model=ShoeResponse, status_code=201)
@@ -32,16 +40,14 @@ async def create_shoe(
     return ShoeResponse.model_validate(shoe)
 
 
-@router.put("/{shoe_id}", response_model=ShoeResponse)
+@router.put("/{shoe_id:uuid}", response_model=ShoeResponse)
 async def update_shoe(
-    shoe_id: str,
+    shoe_id: uuid.UUID,
     body: ShoeUpdateRequest,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    import uuid as _uuid
-
-    shoe = await shoe_service.get_shoe(db, _uuid.UUID(shoe_id), current_user.id)
+    shoe = await shoe_service.get_shoe(db, shoe_id, current_user.id)
     if not shoe:
         raise HTTPException(status_code=404, detail="Shoe not found")
 
@@ -54,36 +60,31 @@ async def update_shoe(
     return ShoeResponse.model_validate(shoe)
 
 
-@router.delete("/{shoe_id}", status_code=204)
+@router.delete("/{shoe_id:uuid}", status_code=204)
 async def delete_shoe(
-    shoe_id: str,
+    shoe_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    import uuid as _uuid
-
-    shoe = await shoe_service.get_shoe(db, _uuid.UUID(shoe_id), current_user.id)
+    shoe = await shoe_service.get_shoe(db, shoe_id, current_user.id)
     if not shoe:
         raise HTTPException(status_code=404, detail="Shoe not found")
 
     await shoe_service.delete_shoe(db, shoe)
 
 
-@router.post("/{shoe_id}/photo", response_model=ShoeResponse)
+@router.post("/{shoe_id:uuid}/photo", response_model=ShoeResponse)
 async def upload_shoe_photo(
-    shoe_id: str,
+    shoe_id: uuid.UUID,
     file: UploadFile = File(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    import uuid as _uuid
-
-    shoe = await shoe_service.get_shoe(db, _uuid.UUID(shoe_id), current_user.id)
+    shoe = await shoe_service.get_shoe(db, shoe_id, current_user.id)
     if not shoe:
         raise HTTPException(status_code=404, detail="Shoe not found")
 
-    file_bytes = await file.read()
     shoe = await shoe_service.upload_shoe_photo(
-        db, shoe, file_bytes, file.filename or "shoe.jpg", file.content_type or "image/jpeg"
+        db, shoe, file.file, file.filename or "shoe.jpg", file.content_type or "image/jpeg"
     )
     return ShoeResponse.model_validate(shoe)
@@ -1,10 +1,11 @@
-import uuid as _uuid
+import uuid
 
 from fastapi import APIRouter, Depends, Query, Path, HTTPException, Body
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database import get_db
 from app.models.user import User
+from app.responses import MsgspecJSONResponse
 from app.models.community_schemas import (
     UserSearchResult,
     UserProfileResponse,
@@ -51,19 +52,14 @@ async def search_users_endpoint(
 # ── User Profile ─────────────────────────────────────────────────────────────
 
 
-@router.get("/users/{user_id}", response_model=UserProfileResponse)
+@router.get("/users/{user_id:uuid}", response_model=UserProfileResponse)
 async def get_user_profile_endpoint(
-    user_id: str = Path(...),
+    user_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a user's public profile."""
-    try:
-        uid = _uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-
-    result = await get_user_profile(db=db, user_id=uid, current_user_id=current_user.id)
+    result = await get_user_profile(db=db, user_id=user_id, current_user_id=current_user.id)
     if result is None:
         raise HTTPException(status_code=404, detail="User not found")
     return UserProfileResponse(**result)
@@ -72,81 +68,61 @@ async def get_user_profile_endpoint(
 # ── Follow / Unfollow ────────────────────────────────────────────────────────
 
 
-@router.post("/users/{user_id}/follow")
+@router.post("/users/{user_id:uuid}/follow")
 async def follow_user_endpoint(
-    user_id: str = Path(...),
+    user_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Follow a user."""
-    try:
-        uid = _uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-
-    if uid == current_user.id:
+    if user_id == current_user.id:
         raise HTTPException(status_code=400, detail="Cannot follow yourself")
 
-    followed = await follow_user(db=db, follower_id=current_user.id, following_id=uid)
+    followed = await follow_user(db=db, follower_id=current_user.id, following_id=user_id)
     return {"followed": followed}
 
 
-@router.delete("/users/{user_id}/follow")
+@router.delete("/users/{user_id:uuid}/follow")
 async def unfollow_user_endpoint(
-    user_id: str = Path(...),
+    user_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Unfollow a user."""
-    try:
-        uid = _uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-
-    unfollowed = await unfollow_user(db=db, follower_id=current_user.id, following_id=uid)
+    unfollowed = await unfollow_user(db=db, follower_id=current_user.id, following_id=user_id)
     return {"unfollowed": unfollowed}
 
 
 # ── Followers / Following ────────────────────────────────────────────────────
 
 
-@router.get("/users/{user_id}/followers", response_model=list[UserSearchResult])
+@router.get("/users/{user_id:uuid}/followers", response_model=list[UserSearchResult])
 async def get_followers_endpoint(
-    user_id: str = Path(...),
+    user_id: uuid.UUID = Path(...),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get a user's followers."""
-    try:
-        uid = _uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-
     results = await get_followers(
-        db=db, user_id=uid, current_user_id=current_user.id,
+        db=db, user_id=user_id, current_user_id=current_user.id,
         limit=limit, offset=offset,
     )
     return [UserSearchResult(**r) for r in results]
 
 
-@router.get("/users/{user_id}/following", response_model=list[UserSearchResult])
+@router.get("/users/{user_id:uuid}/following", response_model=list[UserSearchResult])
 async def get_following_endpoint(
-    user_id: str = Path(...),
+    user_id: uuid.UUID = Path(...),
     limit: int = Query(20, ge=1, le=100),
     offset: int = Query(0, ge=0),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get users that a user follows."""
-    try:
-        uid = _uuid.UUID(user_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid user ID")
-
     results = await get_following(
-        db=db, user_id=uid, current_user_id=current_user.id,
+        db=db, user_id=user_id, current_user_id=current_user.id,
         limit=limit, offset=offset,
     )
     return [UserSearchResult(**r) for r in results]
@@ -168,7 +144,7 @@ async def get_feed(
         db=db, user_id=current_user.id,
         following_only=following_only, limit=limit, offset=offset,
     )
-    return [ActivityFeedItem(**r) for r in results]
+    return MsgspecJSONResponse(results)
 
 
 # ── Teams ─────────────────────────────────────────────────────────────────────
@@ -213,37 +189,27 @@ async def get_my_teams(
     return [TeamResponse(**r) for r in results]
 
 
-@router.get("/teams/{team_id}", response_model=TeamDetailResponse)
+@router.get("/teams/{team_id:uuid}", response_model=TeamDetailResponse)
 async def get_team_detail_endpoint(
-    team_id: str = Path(...),
+    team_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Get team detail with members and leaderboard."""
-    try:
-        tid = _uuid.UUID(team_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid team ID")
-
-    result = await get_team_detail(db=db, team_id=tid, user_id=current_user.id)
+    result = await get_team_detail(db=db, team_id=team_id, user_id=current_user.id)
     if result is None:
         raise HTTPException(status_code=404, detail="Team not found")
-    return TeamDetailResponse(**result)
+    return MsgspecJSONResponse(result)
 
 
-@router.delete("/teams/{team_id}/leave")
+@router.delete("/teams/{team_id:uuid}/leave")
 async def leave_team_endpoint(
-    team_id: str = Path(...),
+    team_id: uuid.UUID = Path(...),
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Leave a team."""
-    try:
-        tid = _uuid.UUID(team_id)
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid team ID")
-
-    left = await leave_team(db=db, user_id=current_user.id, team_id=tid)
+    left = await leave_team(db=db, user_id=current_user.id, team_id=team_id)
     if not left:
         raise HTTPException(status_code=404, detail="Not a member of this team")
     return {"left": True}
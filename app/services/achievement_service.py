@@ -1,15 +1,18 @@
 """Achievement & streak engine: checks for new unlocks after each run sync."""
 
+import hashlib
+import time
 import uuid
-from datetime import datetime, date, timedelta, timezone
-from typing import Optional
+from datetime import date, timedelta
 
-from sqlalchemy import select, func, text
+import msgspec
+from sqlalchemy import case, select, func
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.run import Run
 from app.models.achievement import AchievementDefinition, UserAchievement
+from app.models.community_schemas import RunSyncPayload
 from app.models.streak import UserStreak
 from app.models.personal_best import PersonalBest
 from app.services.social_service import log_activity
@@ -66,65 +69,135 @@ PERF_CATEGORY_MAP = {
 
 async def seed_achievement_definitions(db: AsyncSession) -> None:
     """Insert or update all achievement definitions (idempotent)."""
-    for defn in ACHIEVEMENT_DEFINITIONS:
-        stmt = pg_insert(AchievementDefinition).values(**defn).on_conflict_do_update(
-            index_elements=["id"],
-            set_={k: v for k, v in defn.items() if k != "id"},
-        )
-        await db.execute(stmt)
+    stmt = pg_insert(AchievementDefinition).values(ACHIEVEMENT_DEFINITIONS)
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={k: stmt.excluded[k] for k in ACHIEVEMENT_DEFINITIONS[0] if k != "id"},
+    ))
     await db.commit()
+    await _load_definitions(db)
 
 
-# ── Streak Computation ────────────────────────────────────────────────────────
+# ── Definition Cache ──────────────────────────────────────────────────────────
 
-async def update_streak(
-    db: AsyncSession,
-    user_id: uuid.UUID,
-    run_date: date,
-) -> int:
-    """
-    Update the user's streak after a run. Returns current streak length.
-    A streak counts consecutive calendar days with at least one run.
-    """
+# Definitions only change when the seed runs, so each process keeps them in memory:
+# id -> column dict, in sort order, plus the encoded /achievements body and its ETag.
+# Another worker may seed after this one loaded, so the cache is reloaded after a TTL
+# and whenever a lookup names an id it doesn't hold (at most once a minute)
+_DEFINITIONS_TTL_SECONDS = 300
+_DEFINITIONS_MIN_RELOAD_SECONDS = 60
+_definitions: dict[str, dict] = {}
+_definitions_by_category: dict[str, list[dict]] = {}
+_definitions_json: tuple[bytes, str] = (b"[]", '""')
+_definitions_loaded_at = float("-inf")  # never loaded
+
+
+async def _load_definitions(db: AsyncSession) -> None:
+    global _definitions_json, _definitions_loaded_at
     result = await db.execute(
-        select(UserStreak).where(UserStreak.user_id == user_id)
+        select(*AchievementDefinition.__table__.c).order_by(AchievementDefinition.sort_order)
     )
-    streak = result.scalar_one_or_none()
+    _definitions.clear()
+    _definitions.update((row.id, dict(row._mapping)) for row in result)
+    _definitions_by_category.clear()
+    for defn in _definitions.values():
+        _definitions_by_category.setdefault(defn["category"], []).append(defn)
+    body = msgspec.json.encode(list(_definitions.values()))
+    _definitions_json = (body, f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"')
+    _definitions_loaded_at = time.monotonic()
+
+
+async def _ensure_definitions(db: AsyncSession, ids=()) -> None:
+    age = time.monotonic() - _definitions_loaded_at
+    missing = any(achievement_id not in _definitions for achievement_id in ids)
+    if age >= _DEFINITIONS_TTL_SECONDS or (missing and age >= _DEFINITIONS_MIN_RELOAD_SECONDS):
+        await _load_definitions(db)
+
+
+async def get_achievement_definitions(db: AsyncSession, ids=()) -> dict[str, dict]:
+    """All achievement definitions keyed by id, reloaded if stale or missing any of `ids`."""
+    await _ensure_definitions(db, ids)
+    return _definitions
+
+
+async def get_achievement_definitions_json(db: AsyncSession) -> tuple[bytes, str]:
+    """(JSON list of all definitions, ETag), encoded once per load."""
+    await _ensure_definitions(db)
+    return _definitions_json
+
+
+def user_achievements_to_dicts(rows, definitions: dict[str, dict]) -> list[dict]:
+    """UserAchievementResponse-shaped dicts: each unlock row plus its definition's display fields.
+    Rows whose definition is unknown are dropped, as the inner join they replace would."""
+    return [
+        {
+            "achievement_id": row.achievement_id,
+            "unlocked_at": row.unlocked_at,
+            "run_id": row.run_id,
+            "category": defn["category"],
+            "title": defn["title"],
+            "description": defn["description"],
+            "icon": defn["icon"],
+            "tier": defn["tier"],
+        }
+        for row in rows
+        if (defn := definitions.get(row.achievement_id)) is not None
+    ]
+
 
-    run_date_str = run_date.isoformat()
+# ── Streak Computation ────────────────────────────────────────────────────────
 
-    if streak is None:
-        streak = UserStreak(
+def _advance_streak(user_id: uuid.UUID, run_date: date):
+    """Upsert that moves the user's streak to `run_date` and returns the longest streak."""
+    same_day = UserStreak.last_run_date == run_date
+    consecutive = UserStreak.last_run_date == run_date - timedelta(days=1)
+    # Same day as the last run: unchanged; consecutive day: +1; otherwise broken — reset
+    current = case((same_day, UserStreak.current_streak_days), (consecutive, UserStreak.current_streak_days + 1), else_=1)
+    return (
+        pg_insert(UserStreak)
+        .values(
             user_id=user_id,
             current_streak_days=1,
             longest_streak_days=1,
-            last_run_date=run_date_str,
-            streak_start_date=run_date_str,
+            last_run_date=run_date,
+            streak_start_date=run_date,
         )
-        db.add(streak)
-        return 1
-
-    if streak.last_run_date == run_date_str:
-        # Already ran today — no change
-        return streak.current_streak_days
+        .on_conflict_do_update(
+            index_elements=["user_id"],
+            set_={
+                "current_streak_days": current,
+                "longest_streak_days": func.greatest(UserStreak.longest_streak_days, current),
+                "last_run_date": run_date,
+                "streak_start_date": case((same_day | consecutive, UserStreak.streak_start_date), else_=run_date),
+            },
+        )
+        .returning(UserStreak.longest_streak_days)
+    )
 
-    last_run = date.fromisoformat(streak.last_run_date) if streak.last_run_date else None
 
-    if last_run and (run_date - last_run).days == 1:
-        # Consecutive day
-        streak.current_streak_days += 1
-    elif last_run and (run_date - last_run).days == 0:
-        pass  # Same day, already handled above
-    else:
-        # Streak broken — reset
-        streak.current_streak_days = 1
-        streak.streak_start_date = run_date_str
+async def update_streak(
+    db: AsyncSession,
+    user_id: uuid.UUID,
+    run_dates: list[date],
+) -> list[int]:
+    """
+    Advance the user's streak through each run date in order.
+    Returns the longest streak after each date.
+    A streak counts consecutive calendar days with at least one run.
+    """
+    longest = []
+    last_date = None
+    longest_days = 0
 
-    streak.last_run_date = run_date_str
-    if streak.current_streak_days > streak.longest_streak_days:
-        streak.longest_streak_days = streak.current_streak_days
+    for run_date in run_dates:
+        # Repeating the previous date is a no-op, so it needs no statement
+        if run_date != last_date:
+            result = await db.execute(_advance_streak(user_id, run_date))
+            longest_days = result.scalar_one()
+            last_date = run_date
+        longest.append(longest_days)
 
-    return streak.current_streak_days
+    return longest
 
 
 # ── Achievement Checking ──────────────────────────────────────────────────────
@@ -132,88 +205,106 @@ async def update_streak(
 async def check_achievements_after_sync(
     db: AsyncSession,
     user_id: uuid.UUID,
-    run_id: uuid.UUID,
-    distance_km: float,
-    completed_at: datetime,
+    runs: list[RunSyncPayload],
 ) -> list[dict]:
     """
-    Check all achievement categories after a run sync.
+    Check all achievement categories once for a batch of newly synced runs.
+    Each unlock is credited to the first run that earns it.
     Returns list of newly unlocked achievement dicts.
     """
-    newly_unlocked = []
+    if not runs:
+        return []
+    # "First" means earliest completed, whatever order the client sent the batch in
+    runs = sorted(runs, key=lambda run: run.completed_at)
 
-    # Get user's already-unlocked achievement IDs
+    # Already-unlocked achievement IDs and lifetime km in one round-trip; the batch
+    # is already inserted, so the total includes every run in it
     result = await db.execute(
-        select(UserAchievement.achievement_id).where(UserAchievement.user_id == user_id)
+        select(
+            select(func.array_agg(UserAchievement.achievement_id))
+            .where(UserAchievement.user_id == user_id)
+            .scalar_subquery(),
+            select(func.sum(Run.distance_km)).where(Run.user_id == user_id).scalar_subquery(),
+        )
     )
-    existing_ids = set(result.scalars().all())
+    unlocked_ids, lifetime_km = result.one()
+    existing_ids = set(unlocked_ids or ())
+    lifetime_km = lifetime_km or 0.0
+
+    # Definitions come from the process cache; keep the still-locked ones per category
+    definitions = await get_achievement_definitions(db)
+    pending = {
+        category: [defn for defn in defns if defn["id"] not in existing_ids]
+        for category, defns in _definitions_by_category.items()
+    }
 
-    # Get all definitions
-    result = await db.execute(select(AchievementDefinition).order_by(AchievementDefinition.sort_order))
-    definitions = result.scalars().all()
+    # achievement id -> the run that unlocks it
+    unlocks: dict[str, RunSyncPayload] = {}
 
     # ── 1. Distance achievements (lifetime total km) ──
-    dist_result = await db.execute(
-        select(func.sum(Run.distance_km)).where(Run.user_id == user_id)
-    )
-    lifetime_km = dist_result.scalar() or 0.0
-
-    for defn in definitions:
-        if defn.category != "distance" or defn.id in existing_ids:
-            continue
-        if lifetime_km >= defn.threshold:
-            unlocked = await _unlock(db, user_id, defn.id, run_id, completed_at)
-            if unlocked:
-                newly_unlocked.append(_defn_to_dict(defn))
+    # Credit the run whose running total crosses each threshold. The total after a run
+    # is the lifetime total minus what later runs in the batch added, so the last run
+    # sees exactly lifetime_km
+    later_km = [0.0] * len(runs)
+    for i in range(len(runs) - 2, -1, -1):
+        later_km[i] = later_km[i + 1] + runs[i + 1].distance_km
+    for run, km_after_run in zip(runs, later_km):
+        total_km = lifetime_km - km_after_run
+        for defn in pending.get("distance", ()):
+            if defn["id"] not in unlocks and total_km >= defn["threshold"]:
+                unlocks[defn["id"]] = run
 
     # ── 2. Streak achievements ──
-    run_date = completed_at.date() if isinstance(completed_at, datetime) else completed_at
-    current_streak = await update_streak(db, user_id, run_date)
+    longest_streaks = await update_streak(db, user_id, [run.completed_at.date() for run in runs])
 
-    # Also check longest streak
-    streak_result = await db.execute(
-        select(UserStreak).where(UserStreak.user_id == user_id)
-    )
-    streak_row = streak_result.scalar_one_or_none()
-    longest_streak = streak_row.longest_streak_days if streak_row else current_streak
-
-    for defn in definitions:
-        if defn.category != "streak" or defn.id in existing_ids:
-            continue
-        if longest_streak >= defn.threshold:
-            unlocked = await _unlock(db, user_id, defn.id, run_id, completed_at)
-            if unlocked:
-                newly_unlocked.append(_defn_to_dict(defn))
+    for defn in pending.get("streak", ()):
+        for run, longest_streak in zip(runs, longest_streaks):
+            if longest_streak >= defn["threshold"]:
+                unlocks[defn["id"]] = run
+                break
 
     # ── 3. Performance achievements (from personal bests) ──
     pb_result = await db.execute(
         select(PersonalBest).where(PersonalBest.user_id == user_id)
     )
-    pbs = {pb.distance_category: pb.time_seconds for pb in pb_result.scalars().all()}
-
-    for defn in definitions:
-        if defn.category != "performance" or defn.id in existing_ids:
-            continue
-        pb_category = PERF_CATEGORY_MAP.get(defn.id)
-        if pb_category and pb_category in pbs:
-            if pbs[pb_category] <= defn.threshold:
-                unlocked = await _unlock(db, user_id, defn.id, run_id, completed_at)
-                if unlocked:
-                    newly_unlocked.append(_defn_to_dict(defn))
+    pbs = {pb.distance_category: pb for pb in pb_result.scalars().all()}
+    runs_by_id = {run.id: run for run in runs}
+
+    for defn in pending.get("performance", ()):
+        pb = pbs.get(PERF_CATEGORY_MAP.get(defn["id"]))
+        if pb is not None and pb.time_seconds <= defn["threshold"]:
+            # Credit the run that set the PB when it is part of this batch
+            unlocks[defn["id"]] = runs_by_id.get(pb.run_id, runs[0])
 
     # ── 4. Milestone achievements (single-run distance) ──
-    for defn in definitions:
-        if defn.category != "milestone" or defn.id in existing_ids:
-            continue
-        if defn.threshold == 0:
-            # "First run" — any run unlocks it
-            unlocked = await _unlock(db, user_id, defn.id, run_id, completed_at)
-            if unlocked:
-                newly_unlocked.append(_defn_to_dict(defn))
-        elif distance_km >= defn.threshold:
-            unlocked = await _unlock(db, user_id, defn.id, run_id, completed_at)
-            if unlocked:
-                newly_unlocked.append(_defn_to_dict(defn))
+    for defn in pending.get("milestone", ()):
+        for run in runs:
+            # Threshold 0 is "First run" — any run unlocks it
+            if defn["threshold"] == 0 or run.distance_km >= defn["threshold"]:
+                unlocks[defn["id"]] = run
+                break
+
+    if not unlocks:
+        return []
+
+    # One INSERT for every candidate; RETURNING yields only the rows actually added
+    result = await db.execute(
+        pg_insert(UserAchievement)
+        .values([
+            {
+                "user_id": user_id,
+                "achievement_id": achievement_id,
+                "run_id": run.id,
+                "unlocked_at": run.completed_at,
+                "notified": False,
+            }
+            for achievement_id, run in unlocks.items()
+        ])
+        .on_conflict_do_nothing(constraint="uq_user_achievement")
+        .returning(UserAchievement.achievement_id)
+    )
+    inserted_ids = set(result.scalars())
+    newly_unlocked = [_defn_to_dict(defn) for defn in definitions.values() if defn["id"] in inserted_ids]
 
     # Log activity for each newly unlocked achievement
     for ach in newly_unlocked:
@@ -225,33 +316,13 @@ async def check_achievements_after_sync(
     return newly_unlocked
 
 
-async def _unlock(
-    db: AsyncSession,
-    user_id: uuid.UUID,
-    achievement_id: str,
-    run_id: uuid.UUID,
-    unlocked_at: datetime,
-) -> bool:
-    """Attempt to unlock an achievement. Returns True if newly inserted."""
-    stmt = pg_insert(UserAchievement).values(
-        user_id=user_id,
-        achievement_id=achievement_id,
-        run_id=run_id,
-        unlocked_at=unlocked_at,
-        notified="false",
-    ).on_conflict_do_nothing(constraint="uq_user_achievement")
-
-    result = await db.execute(stmt)
-    return result.rowcount > 0
-
-
-def _defn_to_dict(defn: AchievementDefinition) -> dict:
-    """Convert definition to a serializable dict for the sync response."""
+def _defn_to_dict(defn: dict) -> dict:
+    """Convert a cached definition to a serializable dict for the sync response."""
     return {
-        "id": defn.id,
-        "category": defn.category,
-        "title": defn.title,
-        "description": defn.description,
-        "icon": defn.icon,
-        "tier": defn.tier,
+        "id": defn["id"],
+        "category": defn["category"],
+        "title": defn["title"],
+        "description": defn["description"],
+        "icon": defn["icon"],
+        "tier": defn["tier"],
     }
@@ -1,5 +1,7 @@
 """Admin session-based authentication via signed cookies."""
 
+from functools import lru_cache
+
 from fastapi import Request, Depends, HTTPException
 from fastapi.responses import RedirectResponse
 from itsdangerous import URLSafeTimedSerializer, BadSignature, SignatureExpired
@@ -14,7 +16,9 @@ COOKIE_NAME = "stride_admin_session"
 MAX_AGE = 86400 * 7  # 7 days
 
 
+@lru_cache(maxsize=1)
 def _get_serializer() -> URLSafeTimedSerializer:
+    """Built once; the secret comes from the cached settings and never changes at runtime."""
     settings = get_settings()
     secret = settings.admin_session_secret or settings.jwt_secret_key
     return URLSafeTimedSerializer(secret)
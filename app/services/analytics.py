@@ -1,33 +1,44 @@
-import posthog
+from functools import lru_cache
+
+from posthog import Posthog
+
 from app.config import get_settings
 
-_initialized = False
 
+@lru_cache
+def _client() -> Posthog | None:
+    """The process-wide PostHog client, or None when analytics is not configured.
 
-def _init():
-    global _initialized
-    if _initialized:
-        return
+    Calls only enqueue: the client's consumer thread sends events in gzipped
+    batches (every `flush_at` events or `flush_interval` seconds) and retries
+    failed batches, so nothing here waits on the network.
+    """
     settings = get_settings()
-    if settings.posthog_api_key:
-        posthog.api_key = settings.posthog_api_key
-        posthog.host = settings.posthog_host
-    _initialized = True
+    if not settings.posthog_api_key:
+        return None
+    return Posthog(
+        settings.posthog_api_key,
+        host=settings.posthog_host,
+        flush_at=100,
+        flush_interval=2.0,
+        gzip=True,
+    )
 
 
 def capture(user_id: str, event: str, properties: dict | None = None):
-    _init()
-    if posthog.api_key:
-        posthog.capture(distinct_id=user_id, event=event, properties=properties or {})
+    client = _client()
+    if client is not None:
+        client.capture(event, distinct_id=user_id, properties=properties or {})
 
 
 def identify(user_id: str, properties: dict | None = None):
-    _init()
-    if posthog.api_key:
-        posthog.identify(distinct_id=user_id, properties=properties or {})
+    client = _client()
+    if client is not None:
+        client.set(distinct_id=user_id, properties=properties or {})
 
 
 def shutdown():
-    if posthog.api_key:
-        posthog.flush()
-        posthog.shutdown()
+    client = _client()
+    if client is not None:
+        client.flush()
+        client.shutdown()
@@ -1,5 +1,6 @@
 import time
 import logging
+from functools import lru_cache
 from typing import AsyncGenerator, Optional
 
 import anthropic
@@ -10,6 +11,11 @@ from app.config import get_settings
 logger = logging.getLogger(__name__)
 
 
+def _cached_system(system_prompt: str) -> list[dict]:
+    """System block marked for prompt caching; coach prompts are static files, so the prefix is stable."""
+    return [{"type": "text", "text": system_prompt, "cache_control": {"type": "ephemeral"}}]
+
+
 class AnthropicClient:
     """Async Anthropic client with LangFuse observability."""
 
@@ -43,7 +49,7 @@ class AnthropicClient:
 
         async with self.client.messages.stream(
             model=self.model,
-            system=system_prompt,
+            system=_cached_system(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
             temperature=0.7,
             max_tokens=16000,
@@ -107,7 +113,7 @@ class AnthropicClient:
 
         response = await self.client.messages.create(
             model=self.model,
-            system=system_prompt,
+            system=_cached_system(system_prompt),
             messages=[{"role": "user", "content": user_prompt}],
             temperature=0.7,
             max_tokens=16000,
@@ -147,3 +153,9 @@ class AnthropicClient:
             name, response.usage.input_tokens, response.usage.output_tokens, latency_ms,
         )
         return output_text
+
+
+@lru_cache(maxsize=1)
+def get_anthropic_client() -> AnthropicClient:
+    """Process-wide client, so the HTTP connection pool is reused across requests."""
+    return AnthropicClient()
@@ -1,8 +1,11 @@
+import asyncio
+import secrets
+import time
 import uuid
 from datetime import datetime, timedelta, timezone
 
 import httpx
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
@@ -15,7 +18,16 @@ from app.models.user import User
 
 settings = get_settings()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# New hashes are argon2id at the configured cost; existing bcrypt hashes still verify
+# and are flagged for rehash, which login does transparently
+pwd_context = CryptContext(
+    schemes=["argon2", "bcrypt"],
+    deprecated="auto",
+    argon2__type="ID",
+    argon2__memory_cost=settings.password_hash_memory_kib,
+    argon2__time_cost=settings.password_hash_time_cost,
+    argon2__parallelism=settings.password_hash_parallelism,
+)
 security = HTTPBearer()
 
 
@@ -30,28 +42,58 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def time_password_hash() -> float:
+    """Seconds one hash takes at the configured cost (logged at startup)."""
+    start = time.perf_counter()
+    pwd_context.hash(secrets.token_urlsafe(16))
+    return time.perf_counter() - start
+
+
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """Verify, and return a replacement hash when the stored one uses an outdated scheme."""
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
 # ── JWT Tokens ────────────────────────────────────────────────────────────────
 
+# Settings are frozen, so the key and the accepted-algorithm list are fixed at import
+_JWT_SECRET = settings.jwt_secret_key
+_JWT_ALGORITHMS = (settings.jwt_algorithm,)
+
 
 def create_access_token(user_id: uuid.UUID) -> str:
     expire = datetime.now(timezone.utc) + timedelta(
         minutes=settings.jwt_access_token_expire_minutes
     )
     payload = {"sub": str(user_id), "exp": expire}
-    return jwt.encode(payload, settings.jwt_secret_key, algorithm=settings.jwt_algorithm)
+    return jwt.encode(payload, _JWT_SECRET, algorithm=settings.jwt_algorithm)
+
+
+# Verified access tokens: token -> (user_id, cached_until). Repeat requests with the
+# same token skip the signature check; an entry never outlives the token's own exp.
+_TOKEN_CACHE_TTL_SECONDS = 60
+_TOKEN_CACHE_MAX = 10000
+_token_cache: dict[str, tuple[uuid.UUID, float]] = {}
 
 
 def decode_access_token(token: str) -> uuid.UUID:
+    now = time.time()
+    cached = _token_cache.get(token)
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
     try:
-        payload = jwt.decode(
-            token, settings.jwt_secret_key, algorithms=[settings.jwt_algorithm]
-        )
+        payload = jwt.decode(token, _JWT_SECRET, algorithms=_JWT_ALGORITHMS)
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token"
             )
-        return uuid.UUID(user_id)
+        user_uuid = uuid.UUID(user_id)
+        if len(_token_cache) >= _TOKEN_CACHE_MAX:
+            _token_cache.pop(next(iter(_token_cache)))
+        _token_cache[token] = (user_uuid, min(now + _TOKEN_CACHE_TTL_SECONDS, payload.get("exp", now)))
+        return user_uuid
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token"
@@ -60,14 +102,34 @@ def decode_access_token(token: str) -> uuid.UUID:
 
 # ── Social Token Verification ────────────────────────────────────────────────
 
+# One pooled client for Google/Apple, so social logins reuse warm TLS connections
+_http_client: httpx.AsyncClient | None = None
+
+
+def _http() -> httpx.AsyncClient:
+    global _http_client
+    if _http_client is None:
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(5.0),
+            limits=httpx.Limits(max_keepalive_connections=20),
+        )
+    return _http_client
+
+
+async def close_http_client() -> None:
+    """Close the shared social-login HTTP client (app shutdown)."""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
 
 async def verify_google_token(id_token: str) -> dict:
     """Verify a Google ID token and return user info (email, name, sub)."""
-    async with httpx.AsyncClient() as client:
-        resp = await client.get(
-            "https://oauth2.googleapis.com/tokeninfo",
-            params={"id_token": id_token},
-        )
+    resp = await _http().get(
+        "https://oauth2.googleapis.com/tokeninfo",
+        params={"id_token": id_token},
+    )
     if resp.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -87,22 +149,50 @@ async def verify_google_token(id_token: str) -> dict:
     }
 
 
-async def verify_apple_token(identity_token: str) -> dict:
-    """Decode an Apple identity token and return user info.
+# Apple's signing keys by kid. They rotate rarely, so they are refetched hourly, or
+# early when a token names a kid we don't have (rate-limited so bogus kids can't
+# turn every login into a fetch)
+_APPLE_KEYS_TTL_SECONDS = 3600
+_APPLE_KEYS_MIN_REFETCH_SECONDS = 60
+_apple_keys: dict[str, jwk.Key] = {}
+_apple_keys_fetched_at = float("-inf")  # never fetched
+_apple_keys_lock = asyncio.Lock()
 
-    Apple identity tokens are JWTs signed by Apple. We fetch Apple's public
-    keys and verify the signature, issuer, and audience.
-    """
-    # Fetch Apple's public keys
-    async with httpx.AsyncClient() as client:
-        resp = await client.get("https://appleid.apple.com/auth/keys")
+
+async def _get_apple_key(kid: str | None) -> jwk.Key | None:
+    def usable() -> bool:
+        age = time.monotonic() - _apple_keys_fetched_at
+        if age >= _APPLE_KEYS_TTL_SECONDS:
+            return False
+        return kid in _apple_keys or age < _APPLE_KEYS_MIN_REFETCH_SECONDS
+
+    if not usable():
+        async with _apple_keys_lock:
+            # Another login may have refreshed the keys while this one waited
+            if not usable():
+                await _fetch_apple_keys()
+    return _apple_keys.get(kid)
+
+
+async def _fetch_apple_keys() -> None:
+    global _apple_keys, _apple_keys_fetched_at
+    resp = await _http().get("https://appleid.apple.com/auth/keys")
     if resp.status_code != 200:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Could not fetch Apple public keys",
         )
-    apple_keys = resp.json()
+    # Build each RSA public key once here rather than from the JWK on every verify
+    _apple_keys = {key["kid"]: jwk.construct(key, "RS256") for key in resp.json().get("keys", [])}
+    _apple_keys_fetched_at = time.monotonic()
+
 
+async def verify_apple_token(identity_token: str) -> dict:
+    """Decode an Apple identity token and return user info.
+
+    Apple identity tokens are JWTs signed by Apple. We look up the signing key
+    among Apple's (cached) public keys and verify the signature, issuer, and audience.
+    """
     # Decode the token header to find the matching key
     try:
         unverified_header = jwt.get_unverified_header(identity_token)
@@ -112,13 +202,7 @@ async def verify_apple_token(identity_token: str) -> dict:
             detail="Invalid Apple token header",
         )
 
-    # Find the key with matching kid
-    matching_key = None
-    for key in apple_keys.get("keys", []):
-        if key["kid"] == unverified_header.get("kid"):
-            matching_key = key
-            break
-
+    matching_key = await _get_apple_key(unverified_header.get("kid"))
     if matching_key is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
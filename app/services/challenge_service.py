@@ -9,6 +9,7 @@ from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.challenge import Challenge, ChallengeParticipation
+from app.models.community_schemas import RunSyncPayload
 from app.models.run import Run
 from app.models.user import User
 from app.services.leaderboard_service import _fastest_consecutive_time, DISTANCE_CATEGORIES
@@ -118,47 +119,48 @@ async def auto_generate_monthly_challenge(db: AsyncSession) -> None:
 async def check_challenge_participation(
     db: AsyncSession,
     user_id: uuid.UUID,
-    run_id: uuid.UUID,
-    distance_km: float,
-    km_splits_json: Optional[str],
-    completed_at: datetime,
-    is_eligible: bool,
+    runs: list[RunSyncPayload],
 ) -> None:
     """
-    After a run is synced, check if it qualifies for any active challenges
-    the user has joined. Only Bluetooth-verified runs count.
+    After a sync, credit the newly inserted runs to the active challenges
+    the user has joined. Only Bluetooth-verified runs count, so callers pass
+    just the eligible ones.
     """
-    if not is_eligible:
+    if not runs:
         return
 
-    # Get all active challenges the user has joined
+    # One query covering every run's window; each run is matched in memory
     result = await db.execute(
         select(ChallengeParticipation, Challenge)
         .join(Challenge, ChallengeParticipation.challenge_id == Challenge.id)
         .where(
             ChallengeParticipation.user_id == user_id,
-            Challenge.starts_at <= completed_at,
-            Challenge.ends_at >= completed_at,
+            Challenge.starts_at <= max(run.completed_at for run in runs),
+            Challenge.ends_at >= min(run.completed_at for run in runs),
         )
     )
 
     for participation, challenge in result:
-        if challenge.challenge_type == "weekly_race":
-            # Race: check if run covers the distance and has a faster time
-            target_km = DISTANCE_CATEGORIES.get(challenge.distance_category)
-            if target_km is None or distance_km < target_km:
+        for run in runs:
+            if not challenge.starts_at <= run.completed_at <= challenge.ends_at:
                 continue
 
-            if km_splits_json:
-                time_seconds = _fastest_consecutive_time(km_splits_json, target_km)
-                if time_seconds is not None:
-                    if participation.best_time_seconds is None or time_seconds < participation.best_time_seconds:
-                        participation.best_time_seconds = time_seconds
-                        participation.best_run_id = run_id
-
-        elif challenge.challenge_type == "monthly_distance":
-            # Monthly: add distance
-            participation.total_distance_km = (participation.total_distance_km or 0) + distance_km
+            if challenge.challenge_type == "weekly_race":
+                # Race: check if run covers the distance and has a faster time
+                target_km = DISTANCE_CATEGORIES.get(challenge.distance_category)
+                if target_km is None or run.distance_km < target_km:
+                    continue
+
+                if run.km_splits_json:
+                    time_seconds = _fastest_consecutive_time(run.km_splits_json, target_km)
+                    if time_seconds is not None:
+                        if participation.best_time_seconds is None or time_seconds < participation.best_time_seconds:
+                            participation.best_time_seconds = time_seconds
+                            participation.best_run_id = run.id
+
+            elif challenge.challenge_type == "monthly_distance":
+                # Monthly: add distance
+                participation.total_distance_km = (participation.total_distance_km or 0) + run.distance_km
 
 
 # ── Challenge Queries ────────────────────────────────────────────────────────
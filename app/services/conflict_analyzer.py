@@ -5,6 +5,7 @@ Analyzes training plan requests to detect conflicts between user goals
 and their current fitness level, injury history, timeline, and volume.
 """
 
+import hashlib
 import math
 import re
 from datetime import date
@@ -207,15 +208,34 @@ def add_time_buffer(time_str: str, buffer_percent: float = 0.1) -> str:
     return time_str
 
 
+# The analysis is a pure function of the request, so identical requests share a result
+_RESULT_CACHE_MAX = 1024
+
+
 class ConflictAnalyzer:
     """Analyzes training plan requests for potential conflicts."""
-    
+
+    def __init__(self):
+        self._result_cache: dict[bytes, ConflictAnalysisResponse] = {}
+
     def analyze(self, request: TrainingPlanRequest) -> ConflictAnalysisResponse:
         """
         Analyze a training plan request for conflicts.
         
         Returns a ConflictAnalysisResponse with detected conflicts and recommendations.
         """
+        key = hashlib.blake2b(request.model_dump_json().encode(), digest_size=16).digest()
+        cached = self._result_cache.get(key)
+        if cached is not None:
+            return cached
+
+        result = self._analyze(request)
+        if len(self._result_cache) >= _RESULT_CACHE_MAX:
+            self._result_cache.pop(next(iter(self._result_cache)))
+        self._result_cache[key] = result
+        return result
+
+    def _analyze(self, request: TrainingPlanRequest) -> ConflictAnalysisResponse:
         conflicts: list[DetectedConflict] = []
         
         # Check each type of conflict
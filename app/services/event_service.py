@@ -8,6 +8,7 @@ from sqlalchemy import select, func, and_, delete
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.community_schemas import RunSyncPayload
 from app.models.event import Event, EventRegistration
 from app.models.run import Run
 from app.models.user import User
@@ -22,7 +23,6 @@ async def create_event(db: AsyncSession, **kwargs) -> Event:
     event = Event(**kwargs)
     db.add(event)
     await db.commit()
-    await db.refresh(event)
     return event
 
 
@@ -80,10 +80,31 @@ async def list_all_events(
     status_filter: str = "all",
     limit: int = 50,
     offset: int = 0,
-) -> list[Event]:
-    """List all events (admin view, includes inactive)."""
+) -> list:
+    """
+    List all events with their registration counts (admin view, includes inactive).
+    Returns plain rows carrying only the columns the admin list renders.
+    """
     now = datetime.now(timezone.utc)
-    query = select(Event)
+    registration_count = (
+        select(func.count(EventRegistration.id))
+        .where(EventRegistration.event_id == Event.id)
+        .correlate(Event)
+        .scalar_subquery()
+    )
+    query = select(
+        Event.id,
+        Event.title,
+        Event.event_type,
+        Event.distance_category,
+        Event.starts_at,
+        Event.ends_at,
+        Event.max_participants,
+        Event.banner_image_url,
+        Event.is_active,
+        Event.is_featured,
+        registration_count.label("registration_count"),
+    )
 
     if status_filter == "active":
         query = query.where(Event.starts_at <= now, Event.ends_at >= now)
@@ -94,7 +115,7 @@ async def list_all_events(
 
     query = query.order_by(Event.created_at.desc()).limit(limit).offset(offset)
     result = await db.execute(query)
-    return list(result.scalars().all())
+    return result.all()
 
 
 # ── Registration ────────────────────────────────────────────────────────────
@@ -164,14 +185,10 @@ async def unregister_from_event(
 async def check_event_participation(
     db: AsyncSession,
     user_id: uuid.UUID,
-    run_id: uuid.UUID,
-    distance_km: float,
-    km_splits_json: Optional[str],
-    completed_at: datetime,
-    is_eligible: bool,
+    runs: list[RunSyncPayload],
 ) -> None:
-    """After a run is synced, check if it qualifies for any registered events."""
-    if not is_eligible:
+    """After a sync, credit the newly inserted eligible runs to any registered events."""
+    if not runs:
         return
 
     result = await db.execute(
@@ -180,27 +197,31 @@ async def check_event_participation(
         .where(
             EventRegistration.user_id == user_id,
             EventRegistration.status == "registered",
-            Event.starts_at <= completed_at,
-            Event.ends_at >= completed_at,
+            Event.starts_at <= max(run.completed_at for run in runs),
+            Event.ends_at >= min(run.completed_at for run in runs),
         )
     )
 
     for registration, event in result:
-        if event.event_type == "race" or event.event_type == "virtual_race":
-            # Race: check for fastest time over distance
-            target_km = event.distance_km
-            if target_km and distance_km >= target_km:
-                int_target = int(target_km)
-                if km_splits_json:
-                    time_seconds = _fastest_consecutive_time(km_splits_json, int_target)
-                    if time_seconds is not None:
-                        if registration.best_time_seconds is None or time_seconds < registration.best_time_seconds:
-                            registration.best_time_seconds = time_seconds
-                            registration.best_run_id = run_id
-
-        elif event.event_type == "group_run":
-            # Group run: cumulative distance
-            registration.total_distance_km = (registration.total_distance_km or 0) + distance_km
+        for run in runs:
+            if not event.starts_at <= run.completed_at <= event.ends_at:
+                continue
+
+            if event.event_type == "race" or event.event_type == "virtual_race":
+                # Race: check for fastest time over distance
+                target_km = event.distance_km
+                if target_km and run.distance_km >= target_km:
+                    int_target = int(target_km)
+                    if run.km_splits_json:
+                        time_seconds = _fastest_consecutive_time(run.km_splits_json, int_target)
+                        if time_seconds is not None:
+                            if registration.best_time_seconds is None or time_seconds < registration.best_time_seconds:
+                                registration.best_time_seconds = time_seconds
+                                registration.best_run_id = run.id
+
+            elif event.event_type == "group_run":
+                # Group run: cumulative distance
+                registration.total_distance_km = (registration.total_distance_km or 0) + run.distance_km
 
 
 # ── Queries ─────────────────────────────────────────────────────────────────
@@ -286,22 +307,15 @@ async def get_event_list_for_user(
     return results
 
 
-async def get_event_detail(
+async def get_event_leaderboard(
     db: AsyncSession,
-    event_id: uuid.UUID,
-    user_id: uuid.UUID,
+    event: Event,
     limit: int = 50,
     offset: int = 0,
-) -> Optional[dict]:
-    """Get event detail with leaderboard."""
-    result = await db.execute(select(Event).where(Event.id == event_id))
-    event = result.scalar_one_or_none()
-    if event is None:
-        return None
-
+) -> list[dict]:
+    """Ranked leaderboard entries for an event (fastest time for races, distance otherwise)."""
     is_race = event.event_type in ("race", "virtual_race")
 
-    # Build leaderboard
     if is_race:
         lb_query = (
             select(
@@ -313,7 +327,7 @@ async def get_event_detail(
             )
             .join(User, EventRegistration.user_id == User.id)
             .where(
-                EventRegistration.event_id == event_id,
+                EventRegistration.event_id == event.id,
                 EventRegistration.best_time_seconds.isnot(None),
             )
             .order_by(EventRegistration.best_time_seconds.asc())
@@ -329,21 +343,12 @@ async def get_event_detail(
             )
             .join(User, EventRegistration.user_id == User.id)
             .where(
-                EventRegistration.event_id == event_id,
+                EventRegistration.event_id == event.id,
                 EventRegistration.total_distance_km > 0,
             )
             .order_by(EventRegistration.total_distance_km.desc())
         )
 
-    # Total participants
-    count_result = await db.execute(
-        select(func.count())
-        .select_from(EventRegistration)
-        .where(EventRegistration.event_id == event_id)
-    )
-    total_participants = count_result.scalar() or 0
-
-    # Paginated leaderboard
     lb_result = await db.execute(lb_query.limit(limit).offset(offset))
     entries = []
     for idx, row in enumerate(lb_result):
@@ -355,6 +360,31 @@ async def get_event_detail(
             "profile_photo_base64": row.profile_photo_base64,
             "value": float(value) if value else 0,
         })
+    return entries
+
+
+async def get_event_detail(
+    db: AsyncSession,
+    event_id: uuid.UUID,
+    user_id: uuid.UUID,
+    limit: int = 50,
+    offset: int = 0,
+) -> Optional[dict]:
+    """Get event detail with leaderboard."""
+    result = await db.execute(select(Event).where(Event.id == event_id))
+    event = result.scalar_one_or_none()
+    if event is None:
+        return None
+
+    # Total participants
+    count_result = await db.execute(
+        select(func.count())
+        .select_from(EventRegistration)
+        .where(EventRegistration.event_id == event_id)
+    )
+    total_participants = count_result.scalar() or 0
+
+    entries = await get_event_leaderboard(db, event, limit=limit, offset=offset)
 
     # User's registration
     user_reg_result = await db.execute(
@@ -400,7 +430,12 @@ async def get_event_registrations(
     """Get event registrations for admin view."""
     result = await db.execute(
         select(
-            EventRegistration,
+            EventRegistration.id,
+            EventRegistration.user_id,
+            EventRegistration.registered_at,
+            EventRegistration.status,
+            EventRegistration.best_time_seconds,
+            EventRegistration.total_distance_km,
             User.name,
             User.display_name,
             User.email,
@@ -414,16 +449,15 @@ async def get_event_registrations(
 
     registrations = []
     for row in result:
-        reg = row[0]
         registrations.append({
-            "id": str(reg.id),
-            "user_id": str(reg.user_id),
+            "id": str(row.id),
+            "user_id": str(row.user_id),
             "name": row.display_name or row.name or "Runner",
             "email": row.email,
-            "registered_at": reg.registered_at.isoformat(),
-            "status": reg.status,
-            "best_time_seconds": reg.best_time_seconds,
-            "total_distance_km": reg.total_distance_km,
+            "registered_at": row.registered_at.isoformat(),
+            "status": row.status,
+            "best_time_seconds": row.best_time_seconds,
+            "total_distance_km": row.total_distance_km,
         })
 
     return registrations
@@ -1,12 +1,13 @@
 """Leaderboard service: PB computation, yearly distance, and best-time rankings."""
 
-import json
+import base64
 import re
 import uuid
 from datetime import datetime, date, timezone
 from typing import Optional
 
-from sqlalchemy import select, func, extract, case, and_, text
+import msgspec
+from sqlalchemy import Numeric, select, func, case, cast, and_, text, tuple_, lambda_stmt
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -25,6 +26,9 @@ DISTANCE_CATEGORIES = {
     "50K": 50,
 }
 
+# Typed decoder for the km_splits_json payload (a JSON list of split objects)
+_SPLITS_DECODER = msgspec.json.Decoder(list[dict])
+
 # Age group boundaries
 AGE_GROUPS = {
     "18-29": (18, 29),
@@ -57,8 +61,8 @@ def _fastest_consecutive_time(km_splits_json: str, target_km: int) -> Optional[i
     where 'time' is the cumulative time at that kilometer mark.
     """
     try:
-        splits = json.loads(km_splits_json)
-    except (json.JSONDecodeError, TypeError):
+        splits = _SPLITS_DECODER.decode(km_splits_json)
+    except (msgspec.MsgspecError, TypeError):
         return None
 
     if len(splits) < target_km:
@@ -133,17 +137,39 @@ async def compute_personal_bests(
             )
 
 
-def _age_from_dob(dob_str: Optional[str], reference_date: date = None) -> Optional[int]:
-    """Compute age from a DOB string 'YYYY-MM-DD'."""
-    if not dob_str:
-        return None
+def _year_bounds(year: int) -> tuple[datetime, datetime]:
+    """Half-open [Jan 1, next Jan 1) UTC range, so completed_at filters stay indexable."""
+    return (
+        datetime(year, 1, 1, tzinfo=timezone.utc),
+        datetime(year + 1, 1, 1, tzinfo=timezone.utc),
+    )
+
+
+def _encode_cursor(value: float, user_id: uuid.UUID, rank: int) -> str:
+    """Opaque keyset cursor: the last entry's sort value, user id, and rank."""
+    return base64.urlsafe_b64encode(msgspec.json.encode([value, str(user_id), rank])).decode()
+
+
+def _rounded_km(km):
+    """Distance rounded to the metre as NUMERIC; float SUMs drift with row order, so never rank on them raw."""
+    return func.round(cast(km, Numeric), 3)
+
+
+def decode_leaderboard_cursor(cursor: str) -> tuple[float, uuid.UUID, int]:
+    """(value, user_id, rank) from a next_cursor; raises ValueError if malformed."""
     try:
-        dob = datetime.strptime(dob_str, "%Y-%m-%d").date()
-        ref = reference_date or date.today()
-        age = ref.year - dob.year - ((ref.month, ref.day) < (dob.month, dob.day))
-        return age
-    except ValueError:
+        value, user_id, rank = msgspec.json.decode(base64.urlsafe_b64decode(cursor))
+        return float(value), uuid.UUID(user_id), int(rank)
+    except (msgspec.MsgspecError, TypeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def _age_from_dob(dob: Optional[date], reference_date: date = None) -> Optional[int]:
+    """Compute age from a date of birth."""
+    if not dob:
         return None
+    ref = reference_date or date.today()
+    return ref.year - dob.year - ((ref.month, ref.day) < (dob.month, dob.day))
 
 
 def _age_group_filter(age_group: str):
@@ -160,8 +186,8 @@ def _age_group_filter(age_group: str):
 
     return and_(
         User.date_of_birth.isnot(None),
-        User.date_of_birth >= earliest_dob.isoformat(),
-        User.date_of_birth <= latest_dob.isoformat(),
+        User.date_of_birth >= earliest_dob,
+        User.date_of_birth <= latest_dob,
     )
 
 
@@ -173,15 +199,20 @@ async def get_yearly_distance_leaderboard(
     offset: int = 0,
     gender: Optional[str] = None,
     age_group: Optional[str] = None,
+    after: Optional[tuple[float, uuid.UUID, int]] = None,
 ):
     """
     Yearly distance leaderboard: SUM(distance_km) for eligible runs grouped by user.
-    Returns dict with entries, your_rank, your_value, total_participants.
+    Returns dict with entries, your_rank, your_value, total_participants, next_cursor.
+    Pages continue after a decoded next_cursor (keyset) when given, otherwise from `offset`.
     """
+    year_start, year_end = _year_bounds(year)
+
     # Base query: sum distance per user for eligible runs in the given year
     base_filters = [
         Run.is_leaderboard_eligible == True,
-        extract("year", Run.completed_at) == year,
+        Run.completed_at >= year_start,
+        Run.completed_at < year_end,
         User.leaderboard_opt_in == True,
     ]
 
@@ -192,20 +223,31 @@ async def get_yearly_distance_leaderboard(
         if age_filter is not None:
             base_filters.append(age_filter)
 
-    # Leaderboard query
+    # Leaderboard query (user id breaks ties so pages are stable)
+    total_distance = func.sum(Run.distance_km)
+    rank_km = _rounded_km(total_distance)
     leaderboard_q = (
         select(
             User.id.label("user_id"),
             User.display_name,
             User.name,
             User.profile_photo_base64,
-            func.sum(Run.distance_km).label("total_distance"),
+            total_distance.label("total_distance"),
+            rank_km.label("rank_km"),
         )
         .join(Run, Run.user_id == User.id)
         .where(*base_filters)
         .group_by(User.id, User.display_name, User.name, User.profile_photo_base64)
-        .order_by(func.sum(Run.distance_km).desc())
+        .order_by(rank_km.desc(), User.id)
     )
+    if after:
+        last_value, last_user_id, offset = after
+        # Negated so one row comparison matches the (distance desc, id asc) order
+        leaderboard_q = leaderboard_q.having(
+            tuple_(-rank_km, User.id) > tuple_(-_rounded_km(last_value), last_user_id)
+        )
+    else:
+        leaderboard_q = leaderboard_q.offset(offset)
 
     # Total participants
     count_q = (
@@ -217,8 +259,9 @@ async def get_yearly_distance_leaderboard(
     total_participants = total_result.scalar() or 0
 
     # Paginated entries
-    entries_result = await db.execute(leaderboard_q.limit(limit).offset(offset))
+    entries_result = await db.execute(leaderboard_q.limit(limit))
     entries = []
+    row = None
     for idx, row in enumerate(entries_result):
         entries.append({
             "rank": offset + idx + 1,
@@ -227,37 +270,46 @@ async def get_yearly_distance_leaderboard(
             "profile_photo_base64": row.profile_photo_base64,
             "value": round(row.total_distance, 1),
         })
+    next_cursor = (
+        _encode_cursor(float(row.rank_km), row.user_id, offset + len(entries))
+        if len(entries) == limit else None
+    )
 
     # User's own rank (even if not opted in, they can see their own)
     user_rank = None
     user_value = None
 
-    user_distance_q = (
+    # Fixed-shape rank statements are lambda_stmt: built and compiled once per process,
+    # with the closure values (user, year bounds, totals) bound on each call
+    user_distance_q = lambda_stmt(lambda: (
         select(func.sum(Run.distance_km))
         .where(
             Run.user_id == user_id,
             Run.is_leaderboard_eligible == True,
-            extract("year", Run.completed_at) == year,
+            Run.completed_at >= year_start,
+            Run.completed_at < year_end,
         )
-    )
+    ))
     user_dist_result = await db.execute(user_distance_q)
     user_total = user_dist_result.scalar()
 
     if user_total and user_total > 0:
         user_value = round(user_total, 1)
         # Count how many users have more distance
-        rank_q = (
-            select(func.count(func.distinct(Run.user_id)))
+        rank_q = lambda_stmt(lambda: select(func.count()).select_from(
+            select(Run.user_id)
             .join(User, Run.user_id == User.id)
             .where(
                 Run.is_leaderboard_eligible == True,
-                extract("year", Run.completed_at) == year,
+                Run.completed_at >= year_start,
+                Run.completed_at < year_end,
                 User.leaderboard_opt_in == True,
             )
             .group_by(Run.user_id)
-            .having(func.sum(Run.distance_km) > user_total)
-        )
-        rank_result = await db.execute(select(func.count()).select_from(rank_q.subquery()))
+            .having(_rounded_km(func.sum(Run.distance_km)) > _rounded_km(user_total))
+            .subquery()
+        ))
+        rank_result = await db.execute(rank_q)
         users_ahead = rank_result.scalar() or 0
         user_rank = users_ahead + 1
 
@@ -266,6 +318,7 @@ async def get_yearly_distance_leaderboard(
         "your_rank": user_rank,
         "your_value": user_value,
         "total_participants": total_participants,
+        "next_cursor": next_cursor,
     }
 
 
@@ -277,10 +330,12 @@ async def get_best_time_leaderboard(
     offset: int = 0,
     gender: Optional[str] = None,
     age_group: Optional[str] = None,
+    after: Optional[tuple[float, uuid.UUID, int]] = None,
 ):
     """
     Best time leaderboard: fastest PB for a distance category.
-    Returns dict with entries, your_rank, your_value, total_participants.
+    Returns dict with entries, your_rank, your_value, total_participants, next_cursor.
+    Pages continue after a decoded next_cursor (keyset) when given, otherwise from `offset`.
     """
     base_filters = [
         PersonalBest.distance_category == category,
@@ -294,10 +349,11 @@ async def get_best_time_leaderboard(
         if age_filter is not None:
             base_filters.append(age_filter)
 
-    # Leaderboard query (fastest = lowest time_seconds)
+    # Leaderboard query (fastest = lowest time_seconds), walking
+    # ix_personal_bests_category_time_user in order
     leaderboard_q = (
         select(
-            User.id.label("user_id"),
+            PersonalBest.user_id,
             User.display_name,
             User.name,
             User.profile_photo_base64,
@@ -305,8 +361,15 @@ async def get_best_time_leaderboard(
         )
         .join(PersonalBest, PersonalBest.user_id == User.id)
         .where(*base_filters)
-        .order_by(PersonalBest.time_seconds.asc())
+        .order_by(PersonalBest.time_seconds.asc(), PersonalBest.user_id)
     )
+    if after:
+        last_value, last_user_id, offset = after
+        leaderboard_q = leaderboard_q.where(
+            tuple_(PersonalBest.time_seconds, PersonalBest.user_id) > tuple_(int(last_value), last_user_id)
+        )
+    else:
+        leaderboard_q = leaderboard_q.offset(offset)
 
     # Total participants
     count_q = (
@@ -319,8 +382,9 @@ async def get_best_time_leaderboard(
     total_participants = total_result.scalar() or 0
 
     # Paginated entries
-    entries_result = await db.execute(leaderboard_q.limit(limit).offset(offset))
+    entries_result = await db.execute(leaderboard_q.limit(limit))
     entries = []
+    row = None
     for idx, row in enumerate(entries_result):
         entries.append({
             "rank": offset + idx + 1,
@@ -329,24 +393,28 @@ async def get_best_time_leaderboard(
             "profile_photo_base64": row.profile_photo_base64,
             "value": row.time_seconds,
         })
+    next_cursor = (
+        _encode_cursor(row.time_seconds, row.user_id, offset + len(entries))
+        if len(entries) == limit else None
+    )
 
     # User's own rank
     user_rank = None
     user_value = None
 
-    user_pb_q = (
+    user_pb_q = lambda_stmt(lambda: (
         select(PersonalBest.time_seconds)
         .where(
             PersonalBest.user_id == user_id,
             PersonalBest.distance_category == category,
         )
-    )
+    ))
     user_pb_result = await db.execute(user_pb_q)
     user_time = user_pb_result.scalar()
 
     if user_time:
         user_value = user_time
-        rank_q = (
+        rank_q = lambda_stmt(lambda: (
             select(func.count())
             .select_from(PersonalBest)
             .join(User, PersonalBest.user_id == User.id)
@@ -355,7 +423,7 @@ async def get_best_time_leaderboard(
                 PersonalBest.time_seconds < user_time,
                 User.leaderboard_opt_in == True,
             )
-        )
+        ))
         rank_result = await db.execute(rank_q)
         users_ahead = rank_result.scalar() or 0
         user_rank = users_ahead + 1
@@ -365,4 +433,5 @@ async def get_best_time_leaderboard(
         "your_rank": user_rank,
         "your_value": user_value,
         "total_participants": total_participants,
+        "next_cursor": next_cursor,
     }
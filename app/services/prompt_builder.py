@@ -1,5 +1,5 @@
 from pathlib import Path
-from app.models.schemas import TrainingPlanRequest, PlanEditRequest, PerformanceAnalysisRequest, RaceType, PlanMode
+from app.models.schemas import TrainingPlanRequest, PlanEditRequest, PerformanceAnalysisRequest, RaceType, PlanMode, DAY_NAMES
 from app.services.conflict_analyzer import REQUIRED_BENCHMARKS, get_required_benchmarks
 from datetime import timedelta
 
@@ -29,6 +29,8 @@ class PromptBuilder:
     
     def __init__(self):
         self._prompt_cache: dict[str, str] = {}
+        # (coach file, instructions file) -> composed system prompt
+        self._composed_cache: dict[tuple[str, str], str] = {}
         self._prompts_dir = Path(__file__).parent.parent / "prompts"
     
     def _load_prompt(self, filename: str) -> str:
@@ -37,6 +39,13 @@ class PromptBuilder:
             prompt_path = self._prompts_dir / filename
             self._prompt_cache[filename] = prompt_path.read_text(encoding="utf-8")
         return self._prompt_cache[filename]
+
+    def _compose_prompt(self, coach_file: str, instructions_file: str) -> str:
+        """Coach persona followed by task instructions, built once per pair."""
+        key = (coach_file, instructions_file)
+        if key not in self._composed_cache:
+            self._composed_cache[key] = self._load_prompt(coach_file) + "\n\n" + self._load_prompt(instructions_file)
+        return self._composed_cache[key]
     
     def get_system_prompt(self, race_type: RaceType, custom_distance_km: float | None = None) -> str:
         """
@@ -114,9 +123,8 @@ class PromptBuilder:
         cross_training_str = "Auto-select optimal days based on the training schedule"
         
         # Detect partial first week (start date is not Monday)
-        start_day_name = request.start_date.strftime("%A")
-        days_of_week = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
-        start_day_index = days_of_week.index(start_day_name) if start_day_name in days_of_week else 0
+        start_day_index = request.start_date.weekday()
+        start_day_name = DAY_NAMES[start_day_index]
         is_partial_first_week = start_day_name != "Monday"
         days_in_first_week = 7 - start_day_index  # e.g., Saturday = index 5, so 2 days
         
@@ -174,7 +182,7 @@ Stacking Required: {"Yes — stack exactly " + str(total_sessions - available_da
 {"" if not is_partial_first_week else f"""
 PARTIAL FIRST WEEK (MANDATORY)
 The plan starts on {start_day_name}, NOT Monday. Week 1 is a PARTIAL week with only {days_in_first_week} day(s).
-• Week 1 MUST ONLY include days from {start_day_name} through Sunday — do NOT output Monday through {days_of_week[start_day_index - 1] if start_day_index > 0 else "Sunday"} for Week 1
+• Week 1 MUST ONLY include days from {start_day_name} through Sunday — do NOT output Monday through {DAY_NAMES[start_day_index - 1] if start_day_index > 0 else "Sunday"} for Week 1
 • Distribute a reduced training load appropriate for {days_in_first_week} day(s)
 • Weekly volume for Week 1 should be proportionally reduced (roughly {days_in_first_week}/7 of a normal week)
 • Full Monday-through-Sunday weeks begin from Week 2 onwards
@@ -272,10 +280,7 @@ RECOMMENDED MODE INSTRUCTIONS:
 
     def get_analysis_system_prompt(self, race_type: RaceType, custom_distance_km: float | None = None) -> str:
         """Load the performance analysis system prompt, composed with the race-specific coach persona."""
-        coach_file = get_coach_file(race_type, custom_distance_km)
-        coach_persona = self._load_prompt(coach_file)
-        analysis_instructions = self._load_prompt("coach_analysis.txt")
-        return coach_persona + "\n\n" + analysis_instructions
+        return self._compose_prompt(get_coach_file(race_type, custom_distance_km), "coach_analysis.txt")
 
     def build_analysis_user_prompt(self, request: PerformanceAnalysisRequest) -> str:
         """
@@ -333,10 +338,7 @@ Please analyze this athlete's training execution and provide your assessment."""
 
     def get_edit_system_prompt(self, race_type: RaceType, custom_distance_km: float | None = None) -> str:
         """Load the plan modification system prompt, composed with the race-specific coach persona."""
-        coach_file = get_coach_file(race_type, custom_distance_km)
-        coach_persona = self._load_prompt(coach_file)
-        edit_instructions = self._load_prompt("coach_edit.txt")
-        return coach_persona + "\n\n" + edit_instructions
+        return self._compose_prompt(get_coach_file(race_type, custom_distance_km), "coach_edit.txt")
 
     def build_edit_user_prompt(self, request: PlanEditRequest) -> str:
         """
@@ -1,11 +1,12 @@
 import uuid
-from typing import Optional
+from typing import BinaryIO, Optional
 
-from sqlalchemy import select, update
+from sqlalchemy import case, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
 from app.models.shoe import Shoe
-from app.services.storage_service import delete_file
+from app.services.storage_service import upload_file, delete_file
 
 
 async def create_shoe(
@@ -24,7 +25,6 @@ async def create_shoe(
     )
     db.add(shoe)
     await db.commit()
-    await db.refresh(shoe)
     return shoe
 
 
@@ -88,36 +88,39 @@ async def delete_shoe(db: AsyncSession, shoe: Shoe) -> None:
 async def upload_shoe_photo(
     db: AsyncSession,
     shoe: Shoe,
-    file_bytes: bytes,
+    file: BinaryIO,
     filename: str,
     content_type: str,
 ) -> Shoe:
-    from app.services.storage_service import upload_file
-
+    """Replace the shoe's photo; `file` is streamed to storage rather than read into memory."""
     # Delete old photo if replacing
     if shoe.photo_url:
         try:
-            delete_file(shoe.photo_url)
+            await run_in_threadpool(delete_file, shoe.photo_url)
         except Exception:
             pass
 
-    url = upload_file(file_bytes, filename, content_type, folder="shoes")
+    # boto3 is blocking; keep the upload off the event loop
+    url = await run_in_threadpool(upload_file, file, filename, content_type, folder="shoes")
     shoe.photo_url = url
     await db.commit()
     await db.refresh(shoe)
     return shoe
 
 
-async def add_mileage(
+async def add_mileage_bulk(
     db: AsyncSession,
-    shoe_id: uuid.UUID,
     user_id: uuid.UUID,
-    distance_km: float,
+    mileage: dict[uuid.UUID, float],
 ) -> None:
+    """Add each shoe's distance in one UPDATE (shoe_id -> km)."""
+    if not mileage:
+        return
     await db.execute(
         update(Shoe)
-        .where(Shoe.id == shoe_id, Shoe.user_id == user_id)
-        .values(total_distance_km=Shoe.total_distance_km + distance_km)
+        .where(Shoe.id.in_(mileage), Shoe.user_id == user_id)
+        .values(total_distance_km=Shoe.total_distance_km + case(mileage, value=Shoe.id))
+        .execution_options(synchronize_session=False)
     )
 
 
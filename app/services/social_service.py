@@ -244,7 +244,7 @@ async def _get_user_activities(
     result = await db.execute(
         select(ActivityLog)
         .where(ActivityLog.user_id == user_id)
-        .order_by(ActivityLog.created_at.desc())
+        .order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc())
         .limit(limit)
     )
     activities = result.scalars().all()
@@ -291,7 +291,9 @@ async def get_activity_feed(
         # Everyone (exclude private — only show users with completed profiles)
         query = query.where(User.has_completed_profile == True)
 
-    query = query.order_by(ActivityLog.created_at.desc()).limit(limit).offset(offset)
+    # now() is per transaction, so a sync's activities share created_at; the
+    # time-ordered uuid7 id keeps them in insert order and offset pages stable
+    query = query.order_by(ActivityLog.created_at.desc(), ActivityLog.id.desc()).limit(limit).offset(offset)
     result = await db.execute(query)
 
     return [
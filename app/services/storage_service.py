@@ -1,9 +1,12 @@
 """Cloudflare R2 storage service (S3-compatible)."""
 
+import io
 import uuid
+from typing import BinaryIO
 from urllib.parse import urlparse
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.config import Config as BotoConfig
 
 from app.config import get_settings
@@ -21,13 +24,23 @@ def _get_s3_client():
     )
 
 
+# Stream uploads in 1 MB reads; only files over 8 MB switch to multipart
+_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    io_chunksize=1024 * 1024,
+)
+
+
 def upload_file(
-    file_bytes: bytes,
+    file: BinaryIO | bytes,
     filename: str,
     content_type: str,
     folder: str = "events",
 ) -> str:
-    """Upload a file to R2 and return the public URL."""
+    """
+    Upload a file to R2 and return the public URL.
+    Pass the file object (e.g. UploadFile.file) to stream it without a full read into memory.
+    """
     settings = get_settings()
     s3 = _get_s3_client()
 
@@ -35,11 +48,13 @@ def upload_file(
     ext = filename.rsplit(".", 1)[-1] if "." in filename else "bin"
     key = f"{folder}/{uuid.uuid4().hex}.{ext}"
 
-    s3.put_object(
-        Bucket=settings.r2_bucket_name,
-        Key=key,
-        Body=file_bytes,
-        ContentType=content_type,
+    fileobj = io.BytesIO(file) if isinstance(file, bytes) else file
+    s3.upload_fileobj(
+        fileobj,
+        settings.r2_bucket_name,
+        key,
+        ExtraArgs={"ContentType": content_type},
+        Config=_TRANSFER_CONFIG,
     )
 
     return f"{settings.r2_public_url}/{key}"